@@ -37,9 +37,10 @@ def create_app(config_class=FlaskConfig):
         return {"status": "ok"}
     
     # Register commands
-    from app.commands import seed_command, seed_admin_command
+    from app.commands import seed_command, seed_admin_command, serve_command
     app.cli.add_command(seed_command)
     app.cli.add_command(seed_admin_command)
+    app.cli.add_command(serve_command)
 
     # Ensure all tables exist in development (safe: only creates missing ones).
     # In production, use Flask-Migrate: flask db upgrade
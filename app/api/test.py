@@ -1,8 +1,14 @@
 """Test/Sandbox API endpoints for Rule Builder."""
-from flask import request, jsonify
+import orjson
+from flask import Response, request, jsonify, stream_with_context
+
 from app.api import api_bp
 from app.engine import RuleEvaluator
 
+# Configs above this size are evaluated in a Celery worker instead of
+# blocking the WSGI worker for the whole parse+evaluate cycle.
+ASYNC_CONFIG_THRESHOLD = 50_000
+
 
 @api_bp.route("/test/rule", methods=["POST"])
 def test_rule():
@@ -24,17 +30,40 @@ def test_rule():
         return jsonify({"error": "logic_type is required"}), 400
     if not data.get("logic_payload"):
         return jsonify({"error": "logic_payload is required"}), 400
-    
+
+    # Large configs: offload to Celery, client polls /test/rule/<job_id>
+    if len(data["config"]) > ASYNC_CONFIG_THRESHOLD:
+        from app.tasks.test_tasks import test_rule_task
+        job = test_rule_task.delay(
+            config=data["config"],
+            logic_type=data["logic_type"],
+            logic_payload=data["logic_payload"],
+        )
+        return jsonify({"job_id": job.id, "status": "pending"}), 202
+
     evaluator = RuleEvaluator()
     result = evaluator.test_rule(
         config=data["config"],
         logic_type=data["logic_type"],
         logic_payload=data["logic_payload"]
     )
-    
+
     return jsonify(result)
 
 
+@api_bp.route("/test/rule/<job_id>", methods=["GET"])
+def test_rule_status(job_id):
+    """Poll the result of an offloaded /test/rule evaluation."""
+    from app.extensions import celery
+
+    res = celery.AsyncResult(job_id)
+    if res.successful():
+        return jsonify({"status": "done", "result": res.result})
+    if res.failed():
+        return jsonify({"status": "failed", "error": str(res.result)}), 500
+    return jsonify({"status": res.state.lower()}), 202
+
+
 @api_bp.route("/test/parse", methods=["POST"])
 def test_parse():
     """
@@ -43,36 +72,38 @@ def test_parse():
     """
     data = request.get_json()
     config = data.get("config", "")
-    
+
     try:
         from ciscoconfparse2 import CiscoConfParse
         parse = CiscoConfParse(config.splitlines())
-        
-        # Get all parent objects
-        parents = []
-        for obj in parse.objs:
-            if not obj.parent or obj.parent.text == "":
-                parents.append({
-                    "text": obj.text,
-                    "linenum": obj.linenum,
-                    "children": [
-                        {"text": c.text, "linenum": c.linenum}
-                        for c in obj.children
-                    ]
-                })
-        
-        return jsonify({
-            "success": True,
-            "total_lines": len(parse.objs),
-            "structure": parents
-        })
-        
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e)
         })
 
+    def generate():
+        # Stream the structure one parent block at a time so memory stays
+        # O(one parent + children) instead of O(config size).
+        yield b'{"success": true, "total_lines": %d, "structure": [' % len(parse.objs)
+        first = True
+        # Roots are lines at column 0 — one pass, no per-object parent walk.
+        for obj in parse.find_objects(r"^\S"):
+            if not first:
+                yield b","
+            first = False
+            yield orjson.dumps({
+                "text": obj.text,
+                "linenum": obj.linenum,
+                "children": [
+                    {"text": c.text, "linenum": c.linenum}
+                    for c in obj.children
+                ]
+            })
+        yield b"]}"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
 
 @api_bp.route("/test/logic-types", methods=["GET"])
 def get_logic_types():
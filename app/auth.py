@@ -11,13 +11,23 @@ Decorators:
 """
 import functools
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from flask import request, jsonify, session, g, redirect, url_for
 
 logger = logging.getLogger(__name__)
 
+
+def _now_utc() -> datetime:
+    """Current UTC time, naive (matches the DateTime columns).
+
+    Avoids datetime.utcnow(), which is deprecated in 3.12+ and slightly
+    slower than converting time.time() directly.
+    """
+    return datetime.fromtimestamp(time.time(), tz=timezone.utc).replace(tzinfo=None)
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #   Decorators
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -118,9 +128,14 @@ def authenticate(username: str, password: str) -> Optional["User"]:
     # 1. Try local authentication
     user = User.query.filter_by(username=username, auth_source="local").first()
     if user and user.is_active and user.check_password(password):
-        user.last_login_at = datetime.utcnow()
-        from app.extensions import db
-        db.session.commit()
+        # Coalesce last_login_at writes: a synchronous commit per login
+        # means a WAL flush per request under burst auth. 1-minute
+        # precision is enough for this field.
+        now = _now_utc()
+        if not user.last_login_at or now - user.last_login_at >= timedelta(seconds=60):
+            user.last_login_at = now
+            from app.extensions import db
+            db.session.commit()
         return user
 
     # 2. Try LDAP if enabled
@@ -139,106 +154,22 @@ def authenticate(username: str, password: str) -> Optional["User"]:
 def ldap_authenticate(username: str, password: str) -> Optional["User"]:
     """Authenticate against AD via LDAP/LDAPS.
 
-    On first successful bind, creates a local User record with
-    auth_source='ldap' and syncs display_name + email from AD.
+    The bind/search itself lives in app.auth_ldap, which prefers the
+    libldap C bindings (python-ldap) and falls back to ldap3. On first
+    successful bind, creates a local User record with auth_source='ldap'
+    and syncs display_name + email from AD.
     """
-    from app.config import settings
+    from app.auth_ldap import bind_and_fetch_user
 
-    try:
-        import ldap3
-        from ldap3 import Server, Connection, SUBTREE, Tls
-    except ImportError:
-        logger.error("ldap3 package not installed — pip install ldap3")
+    result = bind_and_fetch_user(username, password)
+    if not result:
         return None
 
-    try:
-        # Build server config
-        tls_config = None
-        if settings.LDAP_USE_SSL or settings.LDAP_STARTTLS:
-            import ssl
-            validate_map = {
-                "NONE": ssl.CERT_NONE,
-                "OPTIONAL": ssl.CERT_OPTIONAL,
-                "REQUIRED": ssl.CERT_REQUIRED,
-            }
-            tls_config = Tls(
-                validate=validate_map.get(settings.LDAP_CERT_VALIDATION, ssl.CERT_REQUIRED),
-            )
-
-        server = Server(
-            settings.LDAP_SERVER,
-            port=settings.LDAP_PORT,
-            use_ssl=settings.LDAP_USE_SSL,
-            tls=tls_config,
-            get_info=ldap3.ALL,
-        )
-
-        # Step 1: Bind with service account to find user DN
-        service_conn = Connection(
-            server,
-            user=settings.LDAP_BIND_DN,
-            password=settings.LDAP_BIND_PASSWORD,
-            auto_bind=True,
-            raise_exceptions=True,
-        )
-
-        if settings.LDAP_STARTTLS and not settings.LDAP_USE_SSL:
-            service_conn.start_tls()
-
-        # Search for user
-        user_filter = settings.LDAP_USER_FILTER.replace("{username}", username)
-        attrs = [
-            settings.LDAP_ATTR_USERNAME,
-            settings.LDAP_ATTR_EMAIL,
-            settings.LDAP_ATTR_DISPLAY_NAME,
-            "memberOf",
-        ]
-
-        service_conn.search(
-            search_base=settings.LDAP_BASE_DN,
-            search_filter=user_filter,
-            search_scope=SUBTREE,
-            attributes=attrs,
-        )
-
-        if not service_conn.entries:
-            logger.info(f"LDAP: user '{username}' not found")
-            service_conn.unbind()
-            return None
-
-        entry = service_conn.entries[0]
-        user_dn = entry.entry_dn
-        service_conn.unbind()
-
-        # Step 2: Bind as user to verify password
-        user_conn = Connection(
-            server,
-            user=user_dn,
-            password=password,
-            auto_bind=True,
-            raise_exceptions=True,
-        )
-
-        if settings.LDAP_STARTTLS and not settings.LDAP_USE_SSL:
-            user_conn.start_tls()
+    # Determine role from AD group membership
+    role = _resolve_ldap_role(result["member_of"])
 
-        # If we reach here, auth succeeded
-        user_conn.unbind()
-
-        # Extract attributes
-        display_name = str(getattr(entry, settings.LDAP_ATTR_DISPLAY_NAME, username))
-        email = str(getattr(entry, settings.LDAP_ATTR_EMAIL, ""))
-        member_of = [str(g) for g in getattr(entry, "memberOf", [])]
-
-        # Determine role from AD group membership
-        role = _resolve_ldap_role(member_of)
-
-        # Create or update local User record
-        return _upsert_ldap_user(username, display_name, email, role)
-
-    except Exception as e:
-        logger.error(f"LDAP authentication failed for '{username}': {e}")
-        return None
+    # Create or update local User record
+    return _upsert_ldap_user(username, result["display_name"], result["email"], role)
 
 
 def _resolve_ldap_role(member_of: list[str]) -> str:
@@ -258,34 +189,49 @@ def _resolve_ldap_role(member_of: list[str]) -> str:
 
 
 def _upsert_ldap_user(username: str, display_name: str, email: str, role: str):
-    """Create or update User record for LDAP user."""
+    """Create or update User record for LDAP user.
+
+    Single INSERT ... ON CONFLICT (username) DO UPDATE instead of
+    SELECT + UPDATE/INSERT — one roundtrip per login instead of 2-3.
+    """
+    import uuid
+
+    from sqlalchemy import func
+    from sqlalchemy.dialects.postgresql import insert
+
     from app.models.user import User
     from app.extensions import db
 
-    user = User.query.filter_by(username=username).first()
-
-    if user:
-        # Update attributes from AD
-        user.display_name = display_name
-        user.email = email
-        user.role = role
-        user.auth_source = "ldap"
-        user.last_login_at = datetime.utcnow()
-    else:
-        user = User(
+    stmt = (
+        insert(User.__table__)
+        .values(
+            id=uuid.uuid4(),
             username=username,
             display_name=display_name,
             email=email,
             auth_source="ldap",
             role=role,
             is_active=True,
-            last_login_at=datetime.utcnow(),
+            last_login_at=func.now(),
+        )
+        .on_conflict_do_update(
+            index_elements=["username"],
+            set_={
+                "display_name": display_name,
+                "email": email,
+                "role": role,
+                "auth_source": "ldap",
+                "last_login_at": func.now(),
+            },
         )
-        db.session.add(user)
+        .returning(User.__table__.c.id)
+    )
 
+    user_id = db.session.execute(stmt).scalar_one()
     db.session.commit()
+
     logger.info(f"LDAP user '{username}' authenticated (role={role})")
-    return user
+    return db.session.get(User, user_id)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -0,0 +1,276 @@
+"""LDAP client adapter for the authentication hot path.
+
+Two backends, selected by ``settings.LDAP_BACKEND``:
+
+  - ``python-ldap`` — OpenLDAP C bindings (libldap). BER encode/decode
+    runs in C and the extension releases the GIL during network I/O,
+    so parallel logins under gthread gunicorn don't serialize.
+  - ``ldap3``       — pure-Python fallback for hosts where libldap
+    cannot be installed.
+
+If the preferred backend's package is missing, the other one is tried.
+Both backends implement the same flow as the original ldap3-only code:
+service-account bind → user search → user bind to verify the password.
+"""
+import logging
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _filter_parts(template: str) -> tuple:
+    """Split the LDAP_USER_FILTER template once per distinct value."""
+    return tuple(template.split("{username}"))
+
+
+def _escape_filter_chars(value: str) -> str:
+    """Escape special characters per RFC 4515 for safe filter insertion."""
+    out = []
+    for ch in value:
+        if ch in "\\*()\x00":
+            out.append("\\%02x" % ord(ch))
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _build_user_filter(settings, username: str) -> str:
+    """Render the user search filter with the username escaped."""
+    return _escape_filter_chars(username).join(_filter_parts(settings.LDAP_USER_FILTER))
+
+
+def bind_and_fetch_user(username: str, password: str) -> Optional[dict]:
+    """Verify credentials against AD and return user attributes.
+
+    Returns ``{"display_name": ..., "email": ..., "member_of": [...]}``
+    on success, None on failure (bad credentials, user not found, or
+    LDAP unavailable).
+    """
+    from app.config import settings
+
+    backend = getattr(settings, "LDAP_BACKEND", "python-ldap")
+
+    if backend == "python-ldap":
+        try:
+            return _bind_python_ldap(settings, username, password)
+        except ImportError:
+            logger.warning("python-ldap not installed — falling back to ldap3")
+        except _PythonLdapAuthError:
+            return None
+
+    try:
+        return _bind_ldap3(settings, username, password)
+    except ImportError:
+        logger.error("No usable LDAP backend — pip install python-ldap or ldap3")
+        return None
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#   python-ldap backend (libldap C bindings)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class _PythonLdapAuthError(Exception):
+    """Authentication failed in the python-ldap backend (no fallback)."""
+
+
+def _ldap_uri(settings) -> str:
+    """Build a libldap URI from LDAP_SERVER/LDAP_PORT/LDAP_USE_SSL."""
+    uri = settings.LDAP_SERVER
+    if "://" not in uri:
+        scheme = "ldaps" if settings.LDAP_USE_SSL else "ldap"
+        uri = f"{scheme}://{uri}"
+    # Append the port unless the URL already carries one
+    if uri.rsplit("://", 1)[1].find(":") == -1:
+        uri = f"{uri}:{settings.LDAP_PORT}"
+    return uri
+
+
+def _init_python_ldap_conn(settings, uri):
+    import ldap
+
+    conn = ldap.initialize(uri)
+    conn.set_option(ldap.OPT_REFERRALS, 0)
+    conn.set_option(ldap.OPT_PROTOCOL_VERSION, 3)
+
+    if settings.LDAP_USE_SSL or settings.LDAP_STARTTLS:
+        require_map = {
+            "NONE": ldap.OPT_X_TLS_NEVER,
+            "OPTIONAL": ldap.OPT_X_TLS_ALLOW,
+            "REQUIRED": ldap.OPT_X_TLS_DEMAND,
+        }
+        conn.set_option(
+            ldap.OPT_X_TLS_REQUIRE_CERT,
+            require_map.get(settings.LDAP_CERT_VALIDATION, ldap.OPT_X_TLS_DEMAND),
+        )
+        conn.set_option(ldap.OPT_X_TLS_NEWCTX, 0)
+
+    if settings.LDAP_STARTTLS and not settings.LDAP_USE_SSL:
+        conn.start_tls_s()
+
+    return conn
+
+
+def _decode(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _bind_python_ldap(settings, username: str, password: str) -> Optional[dict]:
+    import ldap
+
+    uri = _ldap_uri(settings)
+
+    try:
+        # Step 1: Bind with service account to find user DN
+        service_conn = _init_python_ldap_conn(settings, uri)
+        service_conn.simple_bind_s(settings.LDAP_BIND_DN, settings.LDAP_BIND_PASSWORD)
+
+        user_filter = _build_user_filter(settings, username)
+        attrs = [
+            settings.LDAP_ATTR_USERNAME,
+            settings.LDAP_ATTR_EMAIL,
+            settings.LDAP_ATTR_DISPLAY_NAME,
+            "memberOf",
+        ]
+
+        results = service_conn.search_s(
+            settings.LDAP_BASE_DN,
+            ldap.SCOPE_SUBTREE,
+            user_filter,
+            attrs,
+        )
+        service_conn.unbind_s()
+
+        # Referrals come back with dn=None — skip them
+        results = [(dn, entry) for dn, entry in results if dn]
+        if not results:
+            logger.info(f"LDAP: user '{username}' not found")
+            raise _PythonLdapAuthError()
+
+        user_dn, entry = results[0]
+
+        # Step 2: Bind as user to verify password
+        user_conn = _init_python_ldap_conn(settings, uri)
+        try:
+            user_conn.simple_bind_s(user_dn, password)
+        except ldap.INVALID_CREDENTIALS:
+            raise _PythonLdapAuthError()
+        finally:
+            user_conn.unbind_s()
+
+        display_name = _decode(
+            entry.get(settings.LDAP_ATTR_DISPLAY_NAME, [username])[0]
+        )
+        email_values = entry.get(settings.LDAP_ATTR_EMAIL, [])
+        email = _decode(email_values[0]) if email_values else ""
+        member_of = [_decode(v) for v in entry.get("memberOf", [])]
+
+        return {
+            "display_name": display_name,
+            "email": email,
+            "member_of": member_of,
+        }
+
+    except _PythonLdapAuthError:
+        raise
+    except ldap.LDAPError as e:
+        logger.error(f"LDAP authentication failed for '{username}': {e}")
+        raise _PythonLdapAuthError()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#   ldap3 backend (pure Python fallback)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _bind_ldap3(settings, username: str, password: str) -> Optional[dict]:
+    import ldap3
+    from ldap3 import Server, Connection, SUBTREE, Tls
+
+    try:
+        # Build server config
+        tls_config = None
+        if settings.LDAP_USE_SSL or settings.LDAP_STARTTLS:
+            import ssl
+            validate_map = {
+                "NONE": ssl.CERT_NONE,
+                "OPTIONAL": ssl.CERT_OPTIONAL,
+                "REQUIRED": ssl.CERT_REQUIRED,
+            }
+            tls_config = Tls(
+                validate=validate_map.get(settings.LDAP_CERT_VALIDATION, ssl.CERT_REQUIRED),
+            )
+
+        server = Server(
+            settings.LDAP_SERVER,
+            port=settings.LDAP_PORT,
+            use_ssl=settings.LDAP_USE_SSL,
+            tls=tls_config,
+            get_info=ldap3.ALL,
+        )
+
+        # Step 1: Bind with service account to find user DN
+        service_conn = Connection(
+            server,
+            user=settings.LDAP_BIND_DN,
+            password=settings.LDAP_BIND_PASSWORD,
+            auto_bind=True,
+            raise_exceptions=True,
+        )
+
+        if settings.LDAP_STARTTLS and not settings.LDAP_USE_SSL:
+            service_conn.start_tls()
+
+        # Search for user
+        user_filter = _build_user_filter(settings, username)
+        attrs = [
+            settings.LDAP_ATTR_USERNAME,
+            settings.LDAP_ATTR_EMAIL,
+            settings.LDAP_ATTR_DISPLAY_NAME,
+            "memberOf",
+        ]
+
+        service_conn.search(
+            search_base=settings.LDAP_BASE_DN,
+            search_filter=user_filter,
+            search_scope=SUBTREE,
+            attributes=attrs,
+        )
+
+        if not service_conn.entries:
+            logger.info(f"LDAP: user '{username}' not found")
+            service_conn.unbind()
+            return None
+
+        entry = service_conn.entries[0]
+        user_dn = entry.entry_dn
+        service_conn.unbind()
+
+        # Step 2: Bind as user to verify password
+        user_conn = Connection(
+            server,
+            user=user_dn,
+            password=password,
+            auto_bind=True,
+            raise_exceptions=True,
+        )
+
+        if settings.LDAP_STARTTLS and not settings.LDAP_USE_SSL:
+            user_conn.start_tls()
+
+        # If we reach here, auth succeeded
+        user_conn.unbind()
+
+        return {
+            "display_name": str(getattr(entry, settings.LDAP_ATTR_DISPLAY_NAME, username)),
+            "email": str(getattr(entry, settings.LDAP_ATTR_EMAIL, "")),
+            "member_of": [str(g) for g in getattr(entry, "memberOf", [])],
+        }
+
+    except ImportError:
+        raise
+    except Exception as e:
+        logger.error(f"LDAP authentication failed for '{username}': {e}")
+        return None
@@ -1,4 +1,6 @@
 
+import os
+
 import click
 from flask.cli import with_appcontext
 from app.extensions import db
@@ -76,11 +78,19 @@ def seed_command():
         }
     ]
     
-    for r_data in rules_data:
-        if not Rule.query.filter_by(title=r_data["title"], policy_id=policy.id).first():
-            r = Rule(policy_id=policy.id, **r_data)
-            db.session.add(r)
-            
+    # One SELECT for all existing titles instead of a query per rule
+    from sqlalchemy import select
+    titles = [r["title"] for r in rules_data]
+    existing = {
+        t for (t,) in db.session.execute(
+            select(Rule.title).where(Rule.policy_id == policy.id, Rule.title.in_(titles))
+        ).all()
+    }
+    db.session.add_all(
+        Rule(policy_id=policy.id, **r_data)
+        for r_data in rules_data
+        if r_data["title"] not in existing
+    )
     db.session.commit()
     click.echo("Rules seeded.")
     
@@ -114,3 +124,29 @@ def seed_admin_command(username, password):
 
     click.echo(f"Created admin user '{username}' with password '{password}'")
     click.echo("⚠️  Change the password after first login!")
+
+
+@click.command("serve")
+@click.option("--workers", type=int, default=None, help="Gunicorn worker processes")
+@click.option("--bind", default=None, help="Bind address (host:port)")
+def serve_command(workers, bind):
+    """Serve the app under Gunicorn instead of the Werkzeug dev server.
+
+    Uses --preload so settings and per-process caches are built once and
+    shared across worker forks via copy-on-write.
+    """
+    from app.config import settings
+
+    workers = workers or settings.GUNICORN_WORKERS
+    bind = bind or settings.GUNICORN_BIND
+
+    os.execvp("gunicorn", [
+        "gunicorn",
+        "-w", str(workers),
+        "-k", "gthread",
+        "--threads", "4",
+        "--keep-alive", "5",
+        "--preload",
+        "-b", bind,
+        "app:create_app()",
+    ])
@@ -1,6 +1,8 @@
 """HCS Flask Application Configuration."""
 import os
 import secrets
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
 
@@ -17,6 +19,10 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Gunicorn (flask serve)
+    GUNICORN_WORKERS: int = 4
+    GUNICORN_BIND: str = "0.0.0.0:8000"
+
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
@@ -40,10 +46,12 @@ class Settings(BaseSettings):
     
     # Authentication
     AUTH_ENABLED: bool = False  # Set to True in production
+    PASSWORD_HASHER: str = "argon2"  # argon2 (argon2-cffi) | pbkdf2 (werkzeug)
     API_TOKEN: str = ""  # Static API token for automation
     
     # LDAP / Active Directory
     LDAP_ENABLED: bool = False
+    LDAP_BACKEND: str = "python-ldap"  # python-ldap (libldap C) | ldap3 (pure Python)
     LDAP_SERVER: str = ""          # ldap://dc.example.com or ldaps://dc.example.com
     LDAP_PORT: int = 389           # 636 for LDAPS
     LDAP_USE_SSL: bool = False     # True for LDAPS
@@ -65,18 +73,32 @@ class Settings(BaseSettings):
         extra = "ignore"  # Allow extra env vars like FLASK_APP without error
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the shared validated Settings instance.
+
+    Memoized so Flask, Celery workers and CLI commands all reuse one
+    instance instead of re-parsing .env and re-running pydantic
+    validation on every import path. Tests that mutate the environment
+    can call get_settings.cache_clear().
+    """
+    s = Settings()
+    # Auto-generate SECRET_KEY if not provided. Done here (not at module
+    # import) so the RNG call and warning happen once per process, inside
+    # the memoized factory.
+    if not s.SECRET_KEY:
+        import warnings
+        s.SECRET_KEY = secrets.token_hex(32)
+        warnings.warn(
+            "SECRET_KEY not set in environment — using auto-generated ephemeral key. "
+            "Sessions will not persist across restarts. Set SECRET_KEY in .env for production.",
+            RuntimeWarning,
+            stacklevel=1,
+        )
+    return s
+
 
-# Auto-generate SECRET_KEY if not provided
-if not settings.SECRET_KEY:
-    import warnings
-    settings.SECRET_KEY = secrets.token_hex(32)
-    warnings.warn(
-        "SECRET_KEY not set in environment — using auto-generated ephemeral key. "
-        "Sessions will not persist across restarts. Set SECRET_KEY in .env for production.",
-        RuntimeWarning,
-        stacklevel=1,
-    )
+settings = get_settings()
 
 
 class FlaskConfig:
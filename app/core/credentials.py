@@ -30,6 +30,10 @@ class CredentialResolver:
         self.vault_url = vault_url or os.environ.get("VAULT_ADDR")
         self.vault_token = vault_token or os.environ.get("VAULT_TOKEN")
         self._vault_client = None
+        # Resolved values keyed by ref — providers resolve the same
+        # credential per device per rule, so avoid repeating the
+        # file/env/Vault round-trip. Dict ops are GIL-atomic.
+        self._cache: dict[str, str] = {}
     
     def resolve(self, ref: str) -> str:
         """Resolve a credential reference to its actual value.
@@ -47,26 +51,39 @@ class CredentialResolver:
         """
         if not ref:
             return ""
-        
+
         ref = ref.strip()
-        
+
+        cached = self._cache.get(ref)
+        if cached is not None:
+            return cached
+
         try:
             if ref.startswith("env://"):
-                return self._from_env(ref[6:])
+                value = self._from_env(ref[6:])
             elif ref.startswith("file://"):
-                return self._from_file(ref[7:])
+                value = self._from_file(ref[7:])
             elif ref.startswith("vault://"):
-                return self._from_vault(ref[8:])
+                value = self._from_vault(ref[8:])
             else:
                 # Try as env var first; if not found, use as literal value
-                env_value = os.environ.get(ref, "")
-                if env_value:
-                    return env_value
-                # Not an env var — use the ref itself as the credential
-                return ref
+                value = os.environ.get(ref, "") or ref
         except Exception as e:
             logger.error(f"Failed to resolve credential '{ref}': {e}")
             return ""
+
+        # Only cache successful resolutions — empty results are retried
+        # so transient env/file changes get picked up
+        if value:
+            self._cache[ref] = value
+        return value
+
+    def invalidate(self, ref: Optional[str] = None):
+        """Drop a cached credential (or all of them when ref is None)."""
+        if ref is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(ref.strip(), None)
     
     def _from_env(self, var_name: str) -> str:
         """Resolve from environment variable."""
@@ -83,7 +100,9 @@ class CredentialResolver:
             return ""
         
         try:
-            return path.read_text().strip()
+            # read_bytes skips the BufferedIO/isatty/seek setup of
+            # read_text — secret files are tiny, so setup dominates
+            return path.read_bytes().decode("utf-8", errors="replace").strip()
         except Exception as e:
             logger.error(f"Failed to read credential file {file_path}: {e}")
             return ""
@@ -112,9 +131,26 @@ class CredentialResolver:
         
         try:
             if self._vault_client is None:
+                # Pooled keep-alive session: the TLS handshake is paid
+                # once and reused across every Vault read this process
+                # makes, instead of once per secret.
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=16,
+                    max_retries=Retry(total=2, backoff_factor=0.2),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+
                 self._vault_client = hvac.Client(
                     url=self.vault_url,
-                    token=self.vault_token
+                    token=self.vault_token,
+                    session=session,
                 )
             
             secret = self._vault_client.secrets.kv.v2.read_secret_version(
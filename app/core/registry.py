@@ -3,6 +3,7 @@
 This module provides a registry pattern for dynamic provider loading,
 making it easy to add new data sources without modifying core code.
 """
+import importlib
 from typing import Type, Dict, Optional, Any
 import logging
 
@@ -26,19 +27,15 @@ class ProviderRegistry:
         provider = registry.get("config", "netconf", config_dict)
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._providers: Dict[str, Dict[str, Type]] = {
-                "config": {},
-                "inventory": {},
-                "checker": {},
-            }
-            cls._instance._initialized = False
-        return cls._instance
-    
+    def __init__(self):
+        self._providers: Dict[str, Dict[str, Type]] = {
+            "config": {},
+            "inventory": {},
+            "checker": {},
+        }
+        self._initialized = False
+
+
     def register(self, category: str, name: str, provider_class: Type):
         """Register a provider class."""
         if category not in self._providers:
@@ -46,17 +43,36 @@ class ProviderRegistry:
         
         self._providers[category][name] = provider_class
         logger.debug(f"Registered {category} provider: {name}")
-    
+
+    def register_lazy(self, category: str, name: str, module_path: str, attr: str):
+        """Register a provider by import path, deferring the import.
+
+        The class is imported on first get() and the entry replaced
+        with it, so unused providers never pull in their (often heavy)
+        transitive dependencies.
+        """
+        if category not in self._providers:
+            self._providers[category] = {}
+
+        self._providers[category][name] = (module_path, attr)
+        logger.debug(f"Registered {category} provider (lazy): {name}")
+
     def get(self, category: str, name: str, config: Optional[dict] = None) -> Any:
         """Get a provider instance."""
         if category not in self._providers:
             raise ValueError(f"Unknown category: {category}")
-        
+
         if name not in self._providers[category]:
             raise ValueError(f"Unknown {category} provider: {name}")
-        
+
         provider_class = self._providers[category][name]
-        
+
+        # Lazy entry — import now and memoize the class in place
+        if type(provider_class) is tuple:
+            module_path, attr = provider_class
+            provider_class = getattr(importlib.import_module(module_path), attr)
+            self._providers[category][name] = provider_class
+
         if config is not None:
             return provider_class(config)
         return provider_class()
@@ -70,69 +86,50 @@ class ProviderRegistry:
         return name in self._providers.get(category, {})
     
     def initialize_defaults(self):
-        """Register all built-in providers."""
+        """Register all built-in providers (lazily, by import path).
+
+        Nothing is imported here — paramiko, ncclient, lxml and friends
+        are only loaded if a run actually uses the provider that needs
+        them.
+        """
         if self._initialized:
             return
-        
+
         # Config providers
-        from app.providers.gitlab import GitLabProvider
-        from app.providers.ssh import SSHProvider
-        from app.providers.api import APIProvider
-        from app.providers.netconf import NetconfProvider
-        from app.providers.local import LocalFileProvider, SingleFileProvider
-        from app.providers.snmp import SNMPProvider
-        
-        self.register("config", "gitlab", GitLabProvider)
-        self.register("config", "ssh", SSHProvider)
-        self.register("config", "api", APIProvider)
-        self.register("config", "netconf", NetconfProvider)
-        self.register("config", "local", LocalFileProvider)
-        self.register("config", "file", SingleFileProvider)
-        self.register("config", "snmp", SNMPProvider)
-        
+        self.register_lazy("config", "gitlab", "app.providers.gitlab", "GitLabProvider")
+        self.register_lazy("config", "ssh", "app.providers.ssh", "SSHProvider")
+        self.register_lazy("config", "api", "app.providers.api", "APIProvider")
+        self.register_lazy("config", "netconf", "app.providers.netconf", "NetconfProvider")
+        self.register_lazy("config", "local", "app.providers.local", "LocalFileProvider")
+        self.register_lazy("config", "file", "app.providers.local", "SingleFileProvider")
+        self.register_lazy("config", "snmp", "app.providers.snmp", "SNMPProvider")
+
         # Firewall-specific providers
-        from app.providers.firewall import (
-            CheckPointProvider, FortiGateProvider, UserGateProvider, PaloAltoProvider
-        )
-        self.register("config", "checkpoint", CheckPointProvider)
-        self.register("config", "fortigate", FortiGateProvider)
-        self.register("config", "usergate", UserGateProvider)
-        self.register("config", "paloalto", PaloAltoProvider)
-        
+        self.register_lazy("config", "checkpoint", "app.providers.firewall", "CheckPointProvider")
+        self.register_lazy("config", "fortigate", "app.providers.firewall", "FortiGateProvider")
+        self.register_lazy("config", "usergate", "app.providers.firewall", "UserGateProvider")
+        self.register_lazy("config", "paloalto", "app.providers.firewall", "PaloAltoProvider")
+
         # Inventory providers
-        from app.inventory import PostgresInventoryProvider
-        from app.inventory import APIInventoryProvider
-        from app.inventory import StaticInventoryProvider
-        
-        self.register("inventory", "postgres", PostgresInventoryProvider)
-        self.register("inventory", "api", APIInventoryProvider)
-        self.register("inventory", "static", StaticInventoryProvider)
-        
+        self.register_lazy("inventory", "postgres", "app.inventory", "PostgresInventoryProvider")
+        self.register_lazy("inventory", "api", "app.inventory", "APIInventoryProvider")
+        self.register_lazy("inventory", "static", "app.inventory", "StaticInventoryProvider")
+
         # Rule checkers
-        from app.engine.simple_match import SimpleMatchChecker
-        from app.engine.block_match import BlockMatchChecker
-        from app.engine.structure_check import StructureChecker
-        from app.engine.textfsm_check import TextFSMChecker
-        from app.engine.xml_check import XMLChecker
-        from app.engine.version_check import VersionChecker
-        from app.engine.advanced_block import AdvancedBlockChecker
-        
-        self.register("checker", "simple_match", SimpleMatchChecker)
-        self.register("checker", "regex_match", SimpleMatchChecker)  # Alias
-        self.register("checker", "block_match", BlockMatchChecker)
-        self.register("checker", "block_context_match", BlockMatchChecker)  # Alias
-        self.register("checker", "structure_check", StructureChecker)
-        self.register("checker", "textfsm_check", TextFSMChecker)
-        self.register("checker", "xml_check", XMLChecker)
-        self.register("checker", "xpath_check", XMLChecker)  # Alias
-        self.register("checker", "version_check", VersionChecker)
-        self.register("checker", "advanced_block_check", AdvancedBlockChecker)
-        self.register("checker", "nested_block_check", AdvancedBlockChecker)  # Alias
-        
-        from app.engine.composite_check import CompositeChecker
-        self.register("checker", "composite_check", CompositeChecker)
-        self.register("checker", "multi_section_check", CompositeChecker)  # Alias
-        
+        self.register_lazy("checker", "simple_match", "app.engine.simple_match", "SimpleMatchChecker")
+        self.register_lazy("checker", "regex_match", "app.engine.simple_match", "SimpleMatchChecker")  # Alias
+        self.register_lazy("checker", "block_match", "app.engine.block_match", "BlockMatchChecker")
+        self.register_lazy("checker", "block_context_match", "app.engine.block_match", "BlockMatchChecker")  # Alias
+        self.register_lazy("checker", "structure_check", "app.engine.structure_check", "StructureChecker")
+        self.register_lazy("checker", "textfsm_check", "app.engine.textfsm_check", "TextFSMChecker")
+        self.register_lazy("checker", "xml_check", "app.engine.xml_check", "XMLChecker")
+        self.register_lazy("checker", "xpath_check", "app.engine.xml_check", "XMLChecker")  # Alias
+        self.register_lazy("checker", "version_check", "app.engine.version_check", "VersionChecker")
+        self.register_lazy("checker", "advanced_block_check", "app.engine.advanced_block", "AdvancedBlockChecker")
+        self.register_lazy("checker", "nested_block_check", "app.engine.advanced_block", "AdvancedBlockChecker")  # Alias
+        self.register_lazy("checker", "composite_check", "app.engine.composite_check", "CompositeChecker")
+        self.register_lazy("checker", "multi_section_check", "app.engine.composite_check", "CompositeChecker")  # Alias
+
         self._initialized = True
         logger.info("Provider registry initialized with defaults")
 
@@ -140,20 +137,38 @@ class ProviderRegistry:
 # Singleton instance
 registry = ProviderRegistry()
 
+# Direct references to the registry's category dicts — shared objects,
+# so register() keeps them in sync. The hot accessors below hit these
+# with a single lookup instead of going through the registry methods
+# and the _initialized re-check on every call.
+_CONFIG_PROVIDERS = registry._providers["config"]
+_INVENTORY_PROVIDERS = registry._providers["inventory"]
+_CHECKERS = registry._providers["checker"]
+
 
 def get_config_provider(source_type: str, config: dict):
     """Get a config provider by type."""
-    registry.initialize_defaults()
-    return registry.get("config", source_type, config)
+    cls = _CONFIG_PROVIDERS.get(source_type)
+    if cls is None or type(cls) is tuple:
+        # Missing or still a lazy (module, attr) entry
+        registry.initialize_defaults()
+        return registry.get("config", source_type, config)
+    return cls(config)
 
 
 def get_inventory_provider(source_type: str, config: dict):
     """Get an inventory provider by type."""
-    registry.initialize_defaults()
-    return registry.get("inventory", source_type, config)
+    cls = _INVENTORY_PROVIDERS.get(source_type)
+    if cls is None or type(cls) is tuple:
+        registry.initialize_defaults()
+        return registry.get("inventory", source_type, config)
+    return cls(config)
 
 
 def get_checker(logic_type: str):
     """Get a rule checker by logic type."""
-    registry.initialize_defaults()
-    return registry.get("checker", logic_type)
+    cls = _CHECKERS.get(logic_type)
+    if cls is None or type(cls) is tuple:
+        registry.initialize_defaults()
+        return registry.get("checker", logic_type)
+    return cls()
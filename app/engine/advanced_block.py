@@ -7,29 +7,246 @@ Enhanced features:
 - Cross-block validation
 - Conditional checks
 """
+import json
 import re
 import logging
+from bisect import bisect_right
+from collections import Counter
 from typing import Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from app.engine.base import RuleChecker, CheckResult, CheckStatus
+
+from app.engine.base import (
+    RuleChecker,
+    CheckResult,
+    CheckStatus,
+    CiscoConfParse,
+    parse_config_cached,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _fast_find_blocks(config_text: str, start_pat: re.Pattern):
+    """Yield (header, child_lines) for indentation-delimited blocks.
+
+    Equivalent to find_parent_objects + all_children for the common
+    case (no explicit end marker), but a single O(n) line scan with no
+    object-graph construction. Lines deeper than the header's indent
+    belong to the block; blank lines are skipped; headers without any
+    children are not parents and are not yielded.
+    """
+    lines = config_text.splitlines()
+    n = len(lines)
+    i = 0
+    while i < n:
+        line = lines[i]
+        if line.strip() and start_pat.search(line):
+            indent = len(line) - len(line.lstrip())
+            children = []
+            j = i + 1
+            while j < n:
+                nxt = lines[j]
+                stripped = nxt.strip()
+                if stripped:
+                    if len(nxt) - len(nxt.lstrip()) <= indent:
+                        break
+                    children.append(stripped)
+                j += 1
+            if children:
+                yield line.strip(), children
+            i = j
+        else:
+            i += 1
+
+
+@dataclass
+class _CompiledCheck:
+    """One payload check with every regex precompiled."""
+    raw: dict
+    pattern: Optional[re.Pattern] = None
+    condition: Optional[re.Pattern] = None
+    group: Optional[list[re.Pattern]] = None
+    nested_start: Optional[re.Pattern] = None
+    nested_checks: list["_CompiledCheck"] = field(default_factory=list)
+
+
+@dataclass
+class _CompiledPayload:
+    """All regexes of an advanced_block_check payload, compiled once."""
+    start: re.Pattern
+    include: Optional[re.Pattern]
+    exclude: Optional[re.Pattern]
+    checks: list[_CompiledCheck]
+    cross_same: list[re.Pattern]
+    cross_unique: list[re.Pattern]
+    # Simple existence checks fused into one alternation — one scan of
+    # the block instead of one per check. Checks that need isolation
+    # (capture/condition/group/nested) stay in slow_checks.
+    fused: Optional[re.Pattern] = None
+    fused_checks: list[_CompiledCheck] = field(default_factory=list)
+    fused_indexes: list[int] = field(default_factory=list)
+    slow_checks: list[_CompiledCheck] = field(default_factory=list)
+    # Metacharacter-free patterns answered by C-level substring search;
+    # (pattern, must_exist) — the mode is resolved at compile time so
+    # the per-block loop is a bare contains + flag compare
+    literal_checks: list[tuple[str, bool]] = field(default_factory=list)
+    # Cross-block pattern buckets fused into one alternation each
+    cross_same_fused: Optional["_FusedCross"] = None
+    cross_unique_fused: Optional["_FusedCross"] = None
+
+
 @dataclass
+class _FusedCross:
+    """A cross_block bucket combined into one alternation."""
+    pattern: re.Pattern
+    indexes: list[int]        # wrapper group numbers, ascending
+    source: list[re.Pattern]  # original compiled patterns, same order
+
+
+def _fuse_cross(patterns: list[re.Pattern], prefix: str) -> Optional["_FusedCross"]:
+    """Combine a cross_block bucket into one scannable alternation."""
+    if len(patterns) < 2:
+        return None
+    try:
+        fused = re.compile(
+            "|".join(f"(?P<{prefix}{i}>{p.pattern})" for i, p in enumerate(patterns)),
+            re.MULTILINE,
+        )
+    except re.error:
+        return None
+    return _FusedCross(
+        pattern=fused,
+        indexes=[fused.groupindex[f"{prefix}{i}"] for i in range(len(patterns))],
+        source=patterns,
+    )
+
+
+# Patterns made only of these characters behave identically as regex and
+# as plain substring ('.' is deliberately excluded — it's a metachar)
+_LITERAL_RE = re.compile(r"^[\w\s\-/:,]+$")
+
+
+# Compiled payloads keyed by their JSON form — rules are re-run against
+# many devices, so compilation cost is paid once per distinct payload.
+_compiled_cache: dict[str, _CompiledPayload] = {}
+_COMPILED_CACHE_MAX = 128
+
+
+def _compile_check(check: dict) -> _CompiledCheck:
+    compiled = _CompiledCheck(raw=check)
+    if check.get("pattern"):
+        compiled.pattern = re.compile(check["pattern"], re.MULTILINE)
+    condition = check.get("condition", {})
+    if condition and condition.get("if_match"):
+        compiled.condition = re.compile(condition["if_match"], re.MULTILINE)
+    if "group" in check:
+        compiled.group = [re.compile(p, re.MULTILINE) for p in check.get("group", [])]
+    if "nested_block" in check:
+        nested = check["nested_block"]
+        compiled.nested_start = re.compile(nested.get("start", ""))
+        compiled.nested_checks = [_compile_check(c) for c in nested.get("checks", [])]
+    return compiled
+
+
+def _fuse_simple_checks(compiled: _CompiledPayload):
+    """Partition checks and fuse the simple ones into one alternation.
+
+    A plain existence check (pattern only — no capture, condition, group
+    or nested block) doesn't need an isolated scan; K of them can be
+    answered by a single finditer pass over the block with a combined
+    (?P<_chk_0>pat0)|(?P<_chk_1>pat1)|... pattern.
+    """
+    simple, slow = [], []
+    for check in compiled.checks:
+        if (
+            check.pattern is not None
+            and check.group is None
+            and check.nested_start is None
+            and check.condition is None
+            and not check.raw.get("capture")
+            and check.raw.get("mode", "must_exist") in ("must_exist", "must_not_exist")
+        ):
+            raw_pattern = check.raw["pattern"]
+            if _LITERAL_RE.match(raw_pattern):
+                # str.__contains__ (two-way search in C) beats the regex
+                # engine for pure literals
+                must_exist = check.raw.get("mode", "must_exist") == "must_exist"
+                compiled.literal_checks.append((raw_pattern, must_exist))
+            else:
+                simple.append(check)
+        else:
+            slow.append(check)
+
+    if len(simple) > 1:
+        try:
+            fused = re.compile(
+                "|".join(f"(?P<_chk_{i}>{c.raw['pattern']})" for i, c in enumerate(simple)),
+                re.MULTILINE,
+            )
+            compiled.fused = fused
+            compiled.fused_checks = simple
+            compiled.fused_indexes = [fused.groupindex[f"_chk_{i}"] for i in range(len(simple))]
+            compiled.slow_checks = slow
+            return
+        except re.error:
+            # Patterns that clash when combined (e.g. duplicate named
+            # groups) fall back to per-check scans.
+            pass
+
+    compiled.slow_checks = simple + slow
+
+
+def _compile_payload(payload: dict) -> _CompiledPayload:
+    """Compile (and memoize) every pattern of a payload."""
+    key = json.dumps(payload, sort_keys=True, default=str)
+    cached = _compiled_cache.get(key)
+    if cached is not None:
+        return cached
+
+    block_config = payload.get("block", {})
+    block_filter = block_config.get("filter", {})
+    cross_block = payload.get("cross_block", {})
+
+    compiled = _CompiledPayload(
+        start=re.compile(block_config.get("start", "")),
+        include=re.compile(block_filter["include"]) if block_filter.get("include") else None,
+        exclude=re.compile(block_filter["exclude"]) if block_filter.get("exclude") else None,
+        checks=[_compile_check(c) for c in payload.get("checks", [])],
+        cross_same=[re.compile(p, re.MULTILINE) for p in cross_block.get("all_same", [])],
+        cross_unique=[re.compile(p, re.MULTILINE) for p in cross_block.get("unique", [])],
+    )
+    _fuse_simple_checks(compiled)
+    compiled.cross_same_fused = _fuse_cross(compiled.cross_same, "_cs_")
+    compiled.cross_unique_fused = _fuse_cross(compiled.cross_unique, "_cu_")
+
+    if len(_compiled_cache) >= _COMPILED_CACHE_MAX:
+        _compiled_cache.clear()
+    _compiled_cache[key] = compiled
+    return compiled
+
+
+@dataclass(slots=True)
 class BlockContext:
     """Context for a matched block."""
     block_text: str
     block_lines: list[str]
     parent_text: Optional[str] = None
     depth: int = 0
-    variables: dict = None
-    
+    variables: Optional[dict[str, str]] = None
+    _text_cache: Optional[str] = None
+
     def __post_init__(self):
         if self.variables is None:
             self.variables = {}
 
+    @property
+    def content(self) -> str:
+        """Joined block text — built at most once per block."""
+        if self._text_cache is None:
+            self._text_cache = "\n".join(self.block_lines)
+        return self._text_cache
+
 
 class AdvancedBlockChecker(RuleChecker):
     """
@@ -169,28 +386,35 @@ class AdvancedBlockChecker(RuleChecker):
     
     def check(self, config_text: str, payload: dict) -> CheckResult:
         """Perform advanced block checking."""
-        try:
-            from ciscoconfparse2 import CiscoConfParse
-        except ImportError:
-            return CheckResult.error(
-                message="ciscoconfparse2 not installed"
-            )
-        
         block_config = payload.get("block", {})
-        checks = payload.get("checks", [])
         cross_block = payload.get("cross_block", {})
         logic = payload.get("logic", "ALL")
         fail_on_no_blocks = payload.get("fail_on_no_blocks", False)
-        
+
         try:
-            parse = CiscoConfParse(config_text.splitlines())
-        except Exception as e:
+            compiled = _compile_payload(payload)
+        except re.error as e:
             return CheckResult.error(
-                message=f"Config parse error: {e}"
+                message=f"Invalid regex in payload: {e}"
             )
-        
-        # Find matching blocks
-        blocks = self._find_blocks(parse, block_config)
+
+        # Find matching blocks. The plain indentation scan covers the
+        # common payloads; only explicit end markers / depth settings
+        # need the full CiscoConfParse object graph.
+        if block_config.get("end") or block_config.get("depth"):
+            if CiscoConfParse is None:
+                return CheckResult.error(
+                    message="ciscoconfparse2 not installed"
+                )
+            try:
+                parse = parse_config_cached(config_text)
+            except Exception as e:
+                return CheckResult.error(
+                    message=f"Config parse error: {e}"
+                )
+            blocks = self._find_blocks(parse, compiled)
+        else:
+            blocks = self._find_blocks_fast(config_text, compiled)
         
         if not blocks:
             if fail_on_no_blocks:
@@ -201,29 +425,48 @@ class AdvancedBlockChecker(RuleChecker):
                 message="No blocks to check"
             )
         
-        # Check each block
+        # Check each block. Only the first MAX_REPORT failing blocks are
+        # kept with full detail — past that only the count is tracked,
+        # so a fleet-wide misconfiguration can't pile up a huge list
+        # just to display ten entries.
+        MAX_REPORT = 10
         all_failures = []
+        extra_failed_blocks = 0
         passed_blocks = 0
         extracted_values = {}  # For cross-block validation
         
-        for block in blocks:
-            block_failures = self._check_block(block, checks)
-            
+        # Per-block checking is independent — regex and substring search
+        # run in C and release the GIL, so blocks can overlap on cores.
+        # The compiled payload is read-only; block.variables writes are
+        # per-block, so _check_block is thread-safe here.
+        if len(blocks) > 4:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(8, len(blocks))) as executor:
+                per_block_failures = list(
+                    executor.map(lambda b: self._check_block(b, compiled), blocks)
+                )
+        else:
+            per_block_failures = [self._check_block(b, compiled) for b in blocks]
+
+        for block, block_failures in zip(blocks, per_block_failures):
             if block_failures:
-                all_failures.append({
-                    "block": block.block_text,
-                    "failures": block_failures
-                })
+                if len(all_failures) < MAX_REPORT:
+                    all_failures.append({
+                        "block": block.block_text,
+                        "failures": block_failures
+                    })
+                else:
+                    extra_failed_blocks += 1
             else:
                 passed_blocks += 1
-            
+
             # Collect values for cross-block validation
             if cross_block:
-                self._collect_cross_block_values(block, cross_block, extracted_values)
-        
+                self._collect_cross_block_values(block, compiled, extracted_values)
+
         # Cross-block validation
         if cross_block and not all_failures:
-            cross_failures = self._validate_cross_block(extracted_values, cross_block)
+            cross_failures = self._validate_cross_block(extracted_values, compiled)
             if cross_failures:
                 all_failures.append({
                     "block": "Cross-block validation",
@@ -241,13 +484,18 @@ class AdvancedBlockChecker(RuleChecker):
         
         if all_failures:
             diff_lines = []
-            for f in all_failures[:10]:  # Limit output
+            for f in all_failures:  # Already capped at MAX_REPORT
                 diff_lines.append(f"Block: {f['block']}")
                 for fail in f['failures'][:5]:
                     diff_lines.append(f"  ✗ {fail}")
-            
+
+            failed_count = len(all_failures) + extra_failed_blocks
+            message = f"{failed_count}/{total_blocks} blocks failed"
+            if extra_failed_blocks:
+                message += f" (showing first {MAX_REPORT})"
+
             return CheckResult.failure(
-                message=f"{len(all_failures)}/{total_blocks} blocks failed",
+                message=message,
                 diff_data="\n".join(diff_lines)
             )
         
@@ -255,212 +503,288 @@ class AdvancedBlockChecker(RuleChecker):
             message=f"All {total_blocks} blocks passed"
         )
     
-    def _find_blocks(self, parse, config: dict) -> list[BlockContext]:
+    def _find_blocks_fast(self, config_text: str, compiled: _CompiledPayload) -> list[BlockContext]:
+        """Find matching blocks with the hand-rolled indentation scan."""
+        blocks = []
+
+        for block_text, block_lines in _fast_find_blocks(config_text, compiled.start):
+            # Apply filters
+            if compiled.include and not compiled.include.search(block_text):
+                continue
+            if compiled.exclude and compiled.exclude.search(block_text):
+                continue
+
+            # Extract variables from start pattern
+            variables = {}
+            match = compiled.start.search(block_text)
+            if match:
+                for i, group in enumerate(match.groups(), 1):
+                    variables[f"${i}"] = group
+
+            blocks.append(BlockContext(
+                block_text=block_text,
+                block_lines=block_lines,
+                variables=variables,
+                depth=0,
+                _text_cache="\n".join(block_lines)
+            ))
+
+        return blocks
+
+    def _find_blocks(self, parse, compiled: _CompiledPayload) -> list[BlockContext]:
         """Find all matching blocks."""
-        start_pattern = config.get("start")
-        include_filter = config.get("filter", {}).get("include")
-        exclude_filter = config.get("filter", {}).get("exclude")
-        
         blocks = []
-        
+
         try:
-            parent_objs = parse.find_parent_objects(start_pattern)
+            parent_objs = parse.find_parent_objects(compiled.start.pattern)
         except Exception as e:
             logger.error(f"Block search failed: {e}")
             return []
-        
+
         for parent in parent_objs:
             block_text = parent.text.strip()
-            
+
             # Apply filters
-            if include_filter and not re.search(include_filter, block_text):
+            if compiled.include and not compiled.include.search(block_text):
                 continue
-            if exclude_filter and re.search(exclude_filter, block_text):
+            if compiled.exclude and compiled.exclude.search(block_text):
                 continue
-            
-            # Get all lines including nested children
+
+            # Get all lines including nested children (join once here so
+            # the helpers never rebuild the text)
             block_lines = [c.text.strip() for c in parent.all_children]
-            
+            block_content = "\n".join(block_lines)
+
             # Extract variables from start pattern
             variables = {}
-            match = re.search(start_pattern, block_text)
+            match = compiled.start.search(block_text)
             if match:
                 for i, group in enumerate(match.groups(), 1):
                     variables[f"${i}"] = group
-            
+
             blocks.append(BlockContext(
                 block_text=block_text,
                 block_lines=block_lines,
                 variables=variables,
-                depth=0
+                depth=0,
+                _text_cache=block_content
             ))
-        
+
         return blocks
     
-    def _check_block(self, block: BlockContext, checks: list[dict]) -> list[str]:
+    def _check_block(self, block: BlockContext, compiled: _CompiledPayload) -> list[str]:
         """Run all checks on a block."""
         failures = []
-        block_content = "\n".join(block.block_lines)
-        
-        for check in checks:
+        block_content = block.content
+
+        # Literal patterns: plain substring test, no regex engine
+        for raw_pattern, must_exist in compiled.literal_checks:
+            if (raw_pattern in block_content) is not must_exist:
+                failures.append(
+                    f"Missing: {raw_pattern}" if must_exist
+                    else f"Found forbidden: {raw_pattern}"
+                )
+
+        # Fast path: all fused existence checks answered by one scan
+        if compiled.fused is not None:
+            matched = set()
+            wanted = len(compiled.fused_checks)
+            indexes = compiled.fused_indexes
+            for m in compiled.fused.finditer(block_content):
+                # Map the matched group back to its check: the wrapper
+                # group is the greatest _chk_ index <= m.lastindex
+                matched.add(bisect_right(indexes, m.lastindex) - 1)
+                if len(matched) == wanted:
+                    break
+            for i, check in enumerate(compiled.fused_checks):
+                found = i in matched
+                if not found:
+                    # finditer is non-overlapping, so a pattern whose
+                    # matches all overlap another alternative's span is
+                    # never credited — a fused hit is trustworthy, a
+                    # fused miss is not. Confirm misses with the
+                    # pattern's own search (only runs for misses).
+                    found = check.pattern.search(block_content) is not None
+                mode = check.raw.get("mode", "must_exist")
+                if mode == "must_exist" and not found:
+                    failures.append(f"Missing: {check.pattern.pattern}")
+                elif mode == "must_not_exist" and found:
+                    failures.append(f"Found forbidden: {check.pattern.pattern}")
+
+        for check in compiled.slow_checks:
             # Grouped check
-            if "group" in check:
+            if check.group is not None:
                 group_result = self._check_group(block_content, check)
                 if group_result:
                     failures.append(group_result)
                 continue
-            
+
             # Nested block check
-            if "nested_block" in check:
-                nested_result = self._check_nested(block.block_lines, check["nested_block"])
+            if check.nested_start is not None:
+                nested_result = self._check_nested(block.block_lines, check)
                 if nested_result:
                     failures.extend(nested_result)
                 continue
-            
+
             # Simple pattern check
-            pattern = check.get("pattern")
-            if not pattern:
+            if check.pattern is None:
                 continue
-            
-            mode = check.get("mode", "must_exist")
-            condition = check.get("condition")
-            
+
+            mode = check.raw.get("mode", "must_exist")
+
             # Check condition first
-            if condition:
-                if_match = condition.get("if_match")
-                if if_match and not re.search(if_match, block_content, re.MULTILINE):
-                    continue  # Condition not met, skip this check
-            
+            if check.condition and not check.condition.search(block_content):
+                continue  # Condition not met, skip this check
+
             # Perform pattern check
-            found = bool(re.search(pattern, block_content, re.MULTILINE))
-            
+            match = check.pattern.search(block_content)
+            found = match is not None
+
             # Extract capture if specified
-            if check.get("capture") and found:
-                match = re.search(pattern, block_content, re.MULTILINE)
-                if match and match.groups():
-                    block.variables[check["capture"]] = match.group(1)
-            
+            if check.raw.get("capture") and match and match.groups():
+                block.variables[check.raw["capture"]] = match.group(1)
+
             if mode == "must_exist" and not found:
-                failures.append(f"Missing: {pattern}")
+                failures.append(f"Missing: {check.pattern.pattern}")
             elif mode == "must_not_exist" and found:
-                failures.append(f"Found forbidden: {pattern}")
-        
+                failures.append(f"Found forbidden: {check.pattern.pattern}")
+
         return failures
-    
-    def _check_group(self, content: str, check: dict) -> Optional[str]:
+
+    def _check_group(self, content: str, check: _CompiledCheck) -> Optional[str]:
         """Check a group of patterns."""
-        group = check.get("group", [])
-        mode = check.get("mode", "all_must_exist")
-        name = check.get("name", "Group check")
-        
-        matches = []
-        for pattern in group:
-            if re.search(pattern, content, re.MULTILINE):
-                matches.append(pattern)
-        
+        group = check.group or []
+        mode = check.raw.get("mode", "all_must_exist")
+        name = check.raw.get("name", "Group check")
+
         if mode == "all_must_exist":
-            if len(matches) != len(group):
-                missing = [p for p in group if p not in matches]
-                return f"{name}: missing {len(missing)} of {len(group)} required lines"
-        
-        elif mode == "any_must_exist":
-            if not matches:
-                return f"{name}: none of {len(group)} options found"
-        
-        elif mode == "none_must_exist":
-            if matches:
-                return f"{name}: found forbidden patterns"
-        
-        elif mode == "exactly_one":
-            if len(matches) != 1:
-                return f"{name}: expected exactly one match, found {len(matches)}"
-        
+            # First miss decides the outcome — skip the rest
+            for pattern in group:
+                if not pattern.search(content):
+                    return f"{name}: missing required line: {pattern.pattern}"
+            return None
+
+        if mode == "any_must_exist":
+            # First hit decides the outcome
+            for pattern in group:
+                if pattern.search(content):
+                    return None
+            return f"{name}: none of {len(group)} options found"
+
+        if mode == "none_must_exist":
+            for pattern in group:
+                if pattern.search(content):
+                    return f"{name}: found forbidden patterns"
+            return None
+
+        if mode == "exactly_one":
+            matches = 0
+            for pattern in group:
+                if pattern.search(content):
+                    matches += 1
+                    if matches > 1:
+                        break
+            if matches != 1:
+                return f"{name}: expected exactly one match, found {matches}"
+
         return None
-    
-    def _check_nested(self, lines: list[str], nested_config: dict) -> list[str]:
+
+    def _check_nested(self, lines: list[str], check: _CompiledCheck) -> list[str]:
         """Check nested block within current block."""
         failures = []
-        start = nested_config.get("start")
-        nested_checks = nested_config.get("checks", [])
-        
-        # Find nested block start
+        start = check.nested_start
+
+        # Find the nested segment as index bounds — no per-line copying,
+        # the lines list is sliced once at the end
         in_nested = False
-        nested_lines = []
-        
-        for line in lines:
-            if re.search(start, line):
+        seg_start = seg_end = 0
+
+        for idx, line in enumerate(lines):
+            if start.search(line):
                 in_nested = True
-                nested_lines = []
+                seg_start = seg_end = idx + 1
                 continue
-            
+
             if in_nested:
                 # Check for end (less indentation or new block)
                 if line and not line.startswith(" ") and not line.startswith("\t"):
                     in_nested = False
                 else:
-                    nested_lines.append(line)
-        
-        if nested_lines:
-            nested_content = "\n".join(nested_lines)
-            for check in nested_checks:
-                pattern = check.get("pattern")
-                mode = check.get("mode", "must_exist")
-                
-                if not pattern:
+                    seg_end = idx + 1
+
+        if seg_end > seg_start:
+            nested_content = "\n".join(lines[seg_start:seg_end])
+            for nested_check in check.nested_checks:
+                if nested_check.pattern is None:
                     continue
-                
-                found = bool(re.search(pattern, nested_content, re.MULTILINE))
-                
+
+                mode = nested_check.raw.get("mode", "must_exist")
+                found = nested_check.pattern.search(nested_content) is not None
+
                 if mode == "must_exist" and not found:
-                    failures.append(f"Nested [{start}]: missing {pattern}")
+                    failures.append(f"Nested [{start.pattern}]: missing {nested_check.pattern.pattern}")
                 elif mode == "must_not_exist" and found:
-                    failures.append(f"Nested [{start}]: found forbidden {pattern}")
-        
+                    failures.append(f"Nested [{start.pattern}]: found forbidden {nested_check.pattern.pattern}")
+
         return failures
-    
+
     def _collect_cross_block_values(
-        self, 
-        block: BlockContext, 
-        cross_block: dict, 
+        self,
+        block: BlockContext,
+        compiled: _CompiledPayload,
         values: dict
     ):
         """Collect values for cross-block validation."""
-        block_content = "\n".join(block.block_lines)
-        
-        for check_type in ["all_same", "unique"]:
-            patterns = cross_block.get(check_type, [])
+        block_content = block.content
+
+        for patterns, fused in (
+            (compiled.cross_same, compiled.cross_same_fused),
+            (compiled.cross_unique, compiled.cross_unique_fused),
+        ):
             for pattern in patterns:
-                if pattern not in values:
-                    values[pattern] = []
-                
-                match = re.search(pattern, block_content, re.MULTILINE)
+                values.setdefault(pattern.pattern, [])
+
+            if fused is not None:
+                # The fused alternation is only trusted as a negative:
+                # its matches are non-overlapping, so a pattern shadowed
+                # by another alternative collects nothing — or the wrong
+                # span's capture. One scan still prunes blocks matching
+                # no pattern in the bucket; matched blocks fall through
+                # to the authoritative per-pattern search below.
+                if fused.pattern.search(block_content) is None:
+                    continue
+
+            for pattern in patterns:
+                match = pattern.search(block_content)
                 if match and match.groups():
-                    values[pattern].append({
+                    values[pattern.pattern].append({
                         "block": block.block_text,
                         "value": match.group(1)
                     })
-    
-    def _validate_cross_block(self, values: dict, cross_block: dict) -> list[str]:
+
+    def _validate_cross_block(self, values: dict, compiled: _CompiledPayload) -> list[str]:
         """Validate cross-block consistency."""
         failures = []
-        
+
         # All same check
-        for pattern in cross_block.get("all_same", []):
-            if pattern in values and len(values[pattern]) > 1:
-                unique_values = set(v["value"] for v in values[pattern])
+        for pattern in compiled.cross_same:
+            key = pattern.pattern
+            if key in values and len(values[key]) > 1:
+                unique_values = set(v["value"] for v in values[key])
                 if len(unique_values) > 1:
                     failures.append(
-                        f"Inconsistent values for '{pattern}': {unique_values}"
+                        f"Inconsistent values for '{key}': {unique_values}"
                     )
-        
+
         # Unique check
-        for pattern in cross_block.get("unique", []):
-            if pattern in values:
-                all_values = [v["value"] for v in values[pattern]]
-                if len(all_values) != len(set(all_values)):
-                    duplicates = [v for v in all_values if all_values.count(v) > 1]
+        for pattern in compiled.cross_unique:
+            key = pattern.pattern
+            if key in values:
+                counts = Counter(v["value"] for v in values[key])
+                duplicates = {v for v, c in counts.items() if c > 1}
+                if duplicates:
                     failures.append(
-                        f"Duplicate values for '{pattern}': {set(duplicates)}"
+                        f"Duplicate values for '{key}': {duplicates}"
                     )
-        
+
         return failures
@@ -1,9 +1,60 @@
 """Base classes for Rule Engine - Strategy Pattern implementation."""
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 from enum import Enum
 
+try:
+    from ciscoconfparse2 import CiscoConfParse
+except ImportError:
+    CiscoConfParse = None
+
+try:
+    import re2  # google-re2 — linear-time engine for compatible patterns
+except ImportError:
+    re2 = None
+
+
+@lru_cache(maxsize=2048)
+def compile_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a rule pattern once per (pattern, flags) pair.
+
+    Rule patterns are stable across the process lifetime, so checkers
+    share this cache instead of re-parsing patterns through re's small
+    internal cache on every check invocation.
+    """
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=2048)
+def compile_user_regex(pattern: str, flags: int = 0):
+    """Compile an untrusted rule pattern, preferring RE2 when available.
+
+    RE2 matches in guaranteed linear time, so a catastrophic-
+    backtracking pattern cannot pin a worker on a multi-MB config.
+    Patterns RE2 cannot express (backreferences, lookarounds) fall back
+    to the stdlib engine.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern, flags)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=32)
+def parse_config_cached(config_text: str):
+    """Parse a config once per unique text.
+
+    An evaluator runs many rules against the same device config; caching
+    the CiscoConfParse instance turns N full parses into one, shared by
+    every block-oriented checker.
+    """
+    return CiscoConfParse(config_text.splitlines())
+
 
 class CheckStatus(str, Enum):
     """Possible check result statuses."""
@@ -13,9 +64,13 @@ class CheckStatus(str, Enum):
     SKIPPED = "SKIPPED"
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckResult:
-    """Result of a single rule check."""
+    """Result of a single rule check.
+
+    Created once per check — slots keep the instances __dict__-free,
+    which matters at result-heavy scan volumes.
+    """
     
     status: CheckStatus
     message: str
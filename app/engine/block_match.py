@@ -1,6 +1,41 @@
 """Block Match Checker - hierarchical config checking with ciscoconfparse2."""
 import re
-from app.engine.base import RuleChecker, CheckResult
+from weakref import WeakKeyDictionary
+
+from app.engine.base import (
+    RuleChecker,
+    CheckResult,
+    CiscoConfParse,
+    compile_regex,
+    parse_config_cached,
+)
+
+# Mode codes resolved at prepare time so the per-block loop compares
+# identities instead of strings
+_MUST_EXIST = 1
+_MUST_NOT_EXIST = 2
+_MODE_OTHER = 0
+
+# Parsed configs are shared across rules (parse_config_cached), so the
+# same parent objects come back for every block rule on a device; their
+# joined child text is identical each time. Weak keys keep entries alive
+# only as long as the parse itself.
+_children_cache: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _children_combined(parent) -> str:
+    """Joined, stripped child text of a block, cached per parent object."""
+    try:
+        cached = _children_cache.get(parent)
+    except TypeError:
+        return "\n".join(c.text.strip() for c in parent.children)
+    if cached is None:
+        cached = "\n".join(c.text.strip() for c in parent.children)
+        try:
+            _children_cache[parent] = cached
+        except TypeError:
+            pass
+    return cached
 
 
 class BlockMatchChecker(RuleChecker):
@@ -32,20 +67,52 @@ class BlockMatchChecker(RuleChecker):
         return errors
     
     def check(self, config: str, payload: dict) -> CheckResult:
-        try:
-            from ciscoconfparse2 import CiscoConfParse
-        except ImportError:
+        if CiscoConfParse is None:
             return CheckResult.error("ciscoconfparse2 is not installed")
-        
+
         parent_pattern = payload["parent_block_start"]
         exclude_filter = payload.get("exclude_filter")
         child_rules = payload["child_rules"]
         logic = payload.get("logic", "ALL")
         
         try:
-            # Parse configuration
-            parse = CiscoConfParse(config.splitlines())
-            
+            # Compile every pattern once, not once per block, and bind
+            # everything the inner loop touches — search method, mode
+            # code and failure string — so per-block work is bare calls
+            # and comparisons. Broken patterns keep their old behaviour:
+            # reported as a failure in each checked block.
+            prepared = []
+            for rule in child_rules:
+                pattern = rule.get("pattern")
+                if not pattern:
+                    continue  # Skip rules with no pattern
+                is_regex = rule.get("is_regex", True)  # Default to regex for flexibility
+                mode = rule.get("mode", "must_exist")
+                search = None
+                error = None
+                if is_regex:
+                    try:
+                        search = compile_regex(pattern, re.MULTILINE).search
+                    except (re.error, TypeError) as e:
+                        error = f"Invalid pattern '{pattern}': {e}"
+                if mode == "must_exist":
+                    mode_code, fail_msg = _MUST_EXIST, f"Missing: {pattern}"
+                elif mode == "must_not_exist":
+                    mode_code, fail_msg = _MUST_NOT_EXIST, f"Found forbidden: {pattern}"
+                else:
+                    mode_code, fail_msg = _MODE_OTHER, None
+                prepared.append((search, pattern, mode_code, fail_msg, error))
+
+            exclude_re = compile_regex(exclude_filter, re.MULTILINE) if exclude_filter else None
+            # Only patterns that span lines need the joined-block scan;
+            # the usual single-line filters are decided per line with
+            # early exit and no concatenation
+            exclude_spans_lines = exclude_filter is not None and "\\n" in exclude_filter
+
+            # Parse configuration (cached — N block rules on one device
+            # config share a single parse)
+            parse = parse_config_cached(config)
+
             # Find all parent blocks
             parent_objs = parse.find_objects(parent_pattern)
             
@@ -63,14 +130,20 @@ class BlockMatchChecker(RuleChecker):
                 parent_text = parent.text.strip()
                 
                 # Check exclude filter
-                if exclude_filter:
-                    children_text = "\n".join(c.text for c in parent.children)
-                    if re.search(exclude_filter, f"{parent_text}\n{children_text}", re.MULTILINE):
+                if exclude_re is not None:
+                    if exclude_spans_lines:
+                        children_text = "\n".join(c.text for c in parent.children)
+                        excluded = exclude_re.search(f"{parent_text}\n{children_text}") is not None
+                    else:
+                        excluded = exclude_re.search(parent_text) is not None or any(
+                            exclude_re.search(c.text) for c in parent.children
+                        )
+                    if excluded:
                         blocks_skipped += 1
                         continue
-                
+
                 blocks_checked += 1
-                block_failures = self._check_block(parent, child_rules, logic)
+                block_failures = self._check_block(parent, prepared, logic)
                 
                 if block_failures:
                     all_failures.append({
@@ -106,41 +179,47 @@ class BlockMatchChecker(RuleChecker):
         except Exception as e:
             return CheckResult.error(f"Parse error: {str(e)}")
     
-    def _check_block(self, parent, child_rules: list[dict], logic: str) -> list[str]:
-        """Check a single block against child rules."""
-        failures = []
-        passes = 0
-        
-        # Get all children text for searching
-        children_text = [c.text.strip() for c in parent.children]
-        children_combined = "\n".join(children_text)
-        
-        for rule in child_rules:
-            pattern = rule.get("pattern")
-            if not pattern:
-                continue  # Skip rules with no pattern
-            mode = rule.get("mode", "must_exist")
-            is_regex = rule.get("is_regex", True)  # Default to regex for flexibility
-            
-            # Search in children
-            try:
-                if is_regex:
-                    found = bool(re.search(pattern, children_combined, re.MULTILINE))
+    def _check_block(self, parent, prepared: list[tuple], logic: str) -> list[str]:
+        """Check a single block against precompiled child rules."""
+        # One joined buffer serves both search modes: plain patterns use
+        # a single C-level substring scan instead of a Python loop over
+        # the child lines
+        children_combined = _children_combined(parent)
+
+        # ANY stops at the first passing rule, ALL at the first failing
+        # one — either way roughly half the regex invocations are skipped
+        if logic == "ANY":
+            failures = []
+            for search, pattern, mode_code, fail_msg, error in prepared:
+                if error:
+                    failures.append(error)
+                    continue
+
+                if search is not None:
+                    found = search(children_combined) is not None
                 else:
-                    found = any(pattern in child for child in children_text)
-            except (re.error, TypeError) as e:
-                failures.append(f"Invalid pattern '{pattern}': {e}")
-                continue
-            
-            if mode == "must_exist" and not found:
-                failures.append(f"Missing: {pattern}")
-            elif mode == "must_not_exist" and found:
-                failures.append(f"Found forbidden: {pattern}")
+                    found = pattern in children_combined
+
+                if mode_code is _MUST_EXIST and not found:
+                    failures.append(fail_msg)
+                elif mode_code is _MUST_NOT_EXIST and found:
+                    failures.append(fail_msg)
+                else:
+                    return []  # At least one passed, so block passes
+            return failures
+
+        for search, pattern, mode_code, fail_msg, error in prepared:
+            if error:
+                return [error]
+
+            if search is not None:
+                found = search(children_combined) is not None
             else:
-                passes += 1
-        
-        # Apply logic
-        if logic == "ANY" and passes > 0:
-            return []  # At least one passed, so block passes
-        
-        return failures
+                found = pattern in children_combined
+
+            if mode_code is _MUST_EXIST and not found:
+                return [fail_msg]
+            if mode_code is _MUST_NOT_EXIST and found:
+                return [fail_msg]
+
+        return []
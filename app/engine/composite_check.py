@@ -15,6 +15,8 @@ from app.engine.set_match import SetMatchChecker
 import re
 import json
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -38,32 +40,38 @@ class SectionParser:
         if not isinstance(config, str):
             return {"_default": str(config)}
         
-        # Try JSON first
-        try:
-            parsed = json.loads(config)
-            if isinstance(parsed, dict):
-                return parsed
-        except (json.JSONDecodeError, ValueError):
-            pass
-        
-        # Parse sectioned SSH output
-        sections = {}
-        parts = cls.SECTION_RE.split(config)
-        
-        if len(parts) == 1:
+        # Try JSON first — but only when it can possibly be JSON; a full
+        # json.loads attempt on a large SSH dump scans the whole string
+        # before failing
+        if config.lstrip()[:1] in ("{", "["):
+            try:
+                parsed = json.loads(config)
+                if isinstance(parsed, dict):
+                    return parsed
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        # Parse sectioned SSH output in one pass: slice the original
+        # string by header match spans instead of materializing the
+        # 2N+1 split list
+        matches = list(cls.SECTION_RE.finditer(config))
+
+        if not matches:
             # No sections found — treat entire config as single section
             return {"_default": config}
-        
-        # parts[0] is text before first header (usually empty)
-        if parts[0].strip():
-            sections["_preamble"] = parts[0].strip()
-        
-        # pairs: (section_name, section_content)
-        for i in range(1, len(parts), 2):
-            name = parts[i].strip()
-            content = parts[i + 1].strip() if i + 1 < len(parts) else ""
-            sections[name] = content
-        
+
+        sections = {}
+
+        # Text before the first header (usually empty)
+        preamble = config[: matches[0].start()].strip()
+        if preamble:
+            sections["_preamble"] = preamble
+
+        last = len(matches) - 1
+        for i, m in enumerate(matches):
+            end = matches[i + 1].start() if i < last else len(config)
+            sections[m.group(1).strip()] = config[m.end():end].strip()
+
         return sections
 
 
@@ -112,16 +120,42 @@ class CompositeChecker(RuleChecker):
         "set_match": SetMatchChecker,
     }
     
+    _SECTION_CACHE_MAX = 32
+    # Below this many conditions the pool costs more than it saves
+    _MIN_PARALLEL_CONDITIONS = 4
+
     def __init__(self):
-        self._instances = {}
-    
+        # Sub-checkers are stateless — build them all up front so the
+        # per-condition path is a plain dict lookup
+        self._instances = {name: cls() for name, cls in self.CHECKER_MAP.items()}
+        # One config is typically evaluated against many composite
+        # rules back to back — cache its parsed sections (bounded LRU)
+        self._section_cache: OrderedDict = OrderedDict()
+
+    def _parse_sections(self, config) -> dict:
+        # Only str configs are cached: parsing a dict is a no-op in
+        # SectionParser.parse, and an id()-based key can collide once
+        # the original object is collected and its address reused
+        if not isinstance(config, str):
+            return SectionParser.parse(config)
+
+        key = (len(config), hash(config))
+        sections = self._section_cache.get(key)
+        if sections is None:
+            sections = SectionParser.parse(config)
+            self._section_cache[key] = sections
+            if len(self._section_cache) > self._SECTION_CACHE_MAX:
+                self._section_cache.popitem(last=False)
+        else:
+            self._section_cache.move_to_end(key)
+        return sections
+
+
     def _get_checker(self, checker_type: str) -> RuleChecker:
-        if checker_type not in self._instances:
-            cls = self.CHECKER_MAP.get(checker_type)
-            if cls is None:
-                raise ValueError(f"Unknown sub-checker: {checker_type}")
-            self._instances[checker_type] = cls()
-        return self._instances[checker_type]
+        try:
+            return self._instances[checker_type]
+        except KeyError:
+            raise ValueError(f"Unknown sub-checker: {checker_type}") from None
     
     def validate_payload(self, payload: dict) -> list[str]:
         errors = []
@@ -146,59 +180,71 @@ class CompositeChecker(RuleChecker):
         conditions = payload["conditions"]
         operator = payload.get("operator", "all")
         
-        # Parse config into sections
-        sections = SectionParser.parse(config)
-        
-        results = []
-        details = []
-        
+        # Parse config into sections (cached per instance)
+        sections = self._parse_sections(config)
+
+        # Several conditions often target the same (possibly partial)
+        # section name — resolve each name's scan only once per check
+        section_keys = list(sections)
+        partial_cache: dict = {}
+
+        # Per-condition outcomes as tuples; the display strings are
+        # formatted once at the end instead of inside the hot loop
+        records = []
+        tasks = []
+
         for i, cond in enumerate(conditions):
             section_name = cond.get("section", "_default")
             checker_type = cond["checker"]
             sub_payload = cond["payload"]
-            
+
             # Get section data
             section_data = sections.get(section_name)
             if section_data is None:
-                # Try partial match
-                for key in sections:
-                    if section_name in key:
-                        section_data = sections[key]
-                        break
-            
+                # Try partial match (memoized, misses included)
+                if section_name in partial_cache:
+                    section_data = partial_cache[section_name]
+                else:
+                    for key in section_keys:
+                        if section_name in key:
+                            section_data = sections[key]
+                            break
+                    partial_cache[section_name] = section_data
+
             if section_data is None:
-                details.append(f"[{i}] Section '{section_name}' not found → SKIP")
-                results.append(None)  # Skip missing sections
-                continue
-            
-            try:
-                checker = self._get_checker(checker_type)
-                result = checker.check(section_data, sub_payload)
-                results.append(result.passed)
-                details.append(
-                    f"[{i}] {section_name}/{checker_type}: "
-                    f"{'PASS' if result.passed else 'FAIL'} — {result.message}"
-                )
-            except Exception as e:
-                details.append(f"[{i}] {section_name}/{checker_type}: ERROR — {e}")
-                results.append(False)
-        
-        # Filter out None (skipped) and evaluate
-        valid_results = [r for r in results if r is not None]
-        
+                records.append((i, section_name, checker_type, "SKIP", None))
+                continue  # Skip missing sections
+
+            tasks.append((i, section_name, checker_type, section_data, sub_payload))
+
+        # Conditions are independent, and the sub-checkers spend their
+        # time in C (re, jmespath, ciscoconfparse2), so threads overlap
+        # usefully once there are enough conditions to pay for the pool
+        if len(tasks) >= self._MIN_PARALLEL_CONDITIONS:
+            with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+                outcomes = list(executor.map(self._run_condition, tasks))
+        else:
+            outcomes = [self._run_condition(t) for t in tasks]
+
+        records.extend(o[:5] for o in outcomes)
+        records.sort(key=lambda r: r[0])
+
+        # Skipped conditions carry no verdict
+        valid_results = [o[5] for o in outcomes]
+
+        details = self._format_records(records)
+
         if not valid_results:
             return CheckResult.error(
                 "No sections matched any conditions",
                 details={"conditions": details}
             )
-        
+
         if operator == "all":
             passed = all(valid_results)
         else:
             passed = any(valid_results)
-        
-        detail_text = "\n".join(details)
-        
+
         if passed:
             return CheckResult.success(
                 f"Composite check passed ({operator}): "
@@ -209,6 +255,32 @@ class CompositeChecker(RuleChecker):
             return CheckResult.failure(
                 f"Composite check failed ({operator}): "
                 f"{sum(valid_results)}/{len(valid_results)} conditions met",
-                diff_data=detail_text,
+                diff_data="\n".join(details),
                 details={"conditions": details}
             )
+
+    def _run_condition(self, task: tuple) -> tuple:
+        """Evaluate one resolved condition; returns a record tuple with
+        the pass verdict appended."""
+        i, section_name, checker_type, section_data, sub_payload = task
+        try:
+            checker = self._get_checker(checker_type)
+            result = checker.check(section_data, sub_payload)
+            return (
+                i, section_name, checker_type,
+                "PASS" if result.passed else "FAIL", result.message,
+                result.passed,
+            )
+        except Exception as e:
+            return (i, section_name, checker_type, "ERROR", str(e), False)
+
+    @staticmethod
+    def _format_records(records: list[tuple]) -> list[str]:
+        """Render per-condition outcome tuples as display strings."""
+        lines = []
+        for i, section, checker_type, status, message in records:
+            if status == "SKIP":
+                lines.append(f"[{i}] Section '{section}' not found → SKIP")
+            else:
+                lines.append(f"[{i}] {section}/{checker_type}: {status} — {message}")
+        return lines
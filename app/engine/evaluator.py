@@ -41,19 +41,29 @@ class RuleEvaluator:
         "set_match": SetMatchChecker,
         "set_check": SetMatchChecker,  # Alias
     }
-    
+
+    # Deduplicated CHECKERS keys; rebuilt lazily after register_checker
+    _supported_types_cache: list[str] | None = None
+
     def __init__(self):
-        # Instantiate checkers (stateless, can be reused)
-        self._checker_instances: dict[str, RuleChecker] = {}
-    
+        # Instantiate checkers up front (stateless, reused); aliases
+        # share a single instance of their class
+        by_class: dict[Type[RuleChecker], RuleChecker] = {}
+        self._checker_instances: dict[str, RuleChecker] = {
+            name: by_class.setdefault(cls, cls())
+            for name, cls in self.CHECKERS.items()
+        }
+
     def _get_checker(self, logic_type: str) -> RuleChecker:
-        """Get or create checker instance for given type."""
-        if logic_type not in self._checker_instances:
+        """Get checker instance for given type."""
+        checker = self._checker_instances.get(logic_type)
+        if checker is None:
+            # Checker registered via register_checker() after init
             checker_class = self.CHECKERS.get(logic_type)
             if checker_class is None:
                 raise ValueError(f"Unknown logic_type: {logic_type}")
-            self._checker_instances[logic_type] = checker_class()
-        return self._checker_instances[logic_type]
+            checker = self._checker_instances[logic_type] = checker_class()
+        return checker
     
     def evaluate(self, config: str | dict, logic_type: str, logic_payload: dict) -> CheckResult:
         """
@@ -99,12 +109,15 @@ class RuleEvaluator:
     @classmethod
     def get_supported_types(cls) -> list[str]:
         """Return list of unique supported logic types."""
-        return list(set(cls.CHECKERS.keys()))
-    
+        if cls._supported_types_cache is None:
+            cls._supported_types_cache = list(set(cls.CHECKERS.keys()))
+        return list(cls._supported_types_cache)
+
     @classmethod
     def register_checker(cls, logic_type: str, checker_class: Type[RuleChecker]):
         """Register a new checker type (for extensibility)."""
         cls.CHECKERS[logic_type] = checker_class
+        cls._supported_types_cache = None
 
 
 # Singleton instance for convenience
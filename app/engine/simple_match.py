@@ -1,6 +1,6 @@
 """Simple Match Checker - regex and text pattern matching."""
 import re
-from app.engine.base import RuleChecker, CheckResult
+from app.engine.base import RuleChecker, CheckResult, compile_regex
 
 
 class SimpleMatchChecker(RuleChecker):
@@ -35,13 +35,16 @@ class SimpleMatchChecker(RuleChecker):
                 flags = re.MULTILINE
                 if case_insensitive:
                     flags |= re.IGNORECASE
-                match = re.search(pattern, config, flags)
+                match = compile_regex(pattern, flags).search(config)
                 found = match is not None
                 raw_value = match.group(0) if match else None
             else:
-                search_config = config.lower() if case_insensitive else config
-                search_pattern = pattern.lower() if case_insensitive else pattern
-                found = search_pattern in search_config
+                if case_insensitive:
+                    # Case-fold in the regex engine instead of allocating
+                    # a lowercased copy of the whole config
+                    found = compile_regex(re.escape(pattern), re.IGNORECASE).search(config) is not None
+                else:
+                    found = pattern in config
                 raw_value = pattern if found else None
                 
         except re.error as e:
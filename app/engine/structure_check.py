@@ -1,7 +1,92 @@
 """Structure Checker - JSON/JMESPath checking for API-based vendors."""
-import jmespath
+import operator
+from functools import lru_cache
+
+# Prefer the community fork when installed — same API surface
+# (compile/search/exceptions) with a faster evaluator
+try:
+    import jmespath_community as jmespath
+except ImportError:
+    import jmespath
+
 from app.engine.base import RuleChecker, CheckResult
 
+try:
+    import numpy as np  # Optional — vectorizes large array comparisons
+except ImportError:
+    np = None
+
+
+@lru_cache(maxsize=4096)
+def _jp_compile(path: str):
+    """Compile a JMESPath expression once; the same rule path is
+    evaluated against many device configs."""
+    return jmespath.compile(path)
+
+
+def _contains(a, b):
+    return b in a if isinstance(a, (str, list)) else False
+
+
+def _not_contains(a, b):
+    return b not in a if isinstance(a, (str, list)) else True
+
+
+def _exists(a, b):
+    return a is not None
+
+
+def _not_exists(a, b):
+    return a is None
+
+
+def _in(a, b):
+    return a in b if isinstance(b, (list, set, frozenset)) else False
+
+
+def _not_in(a, b):
+    return a not in b if isinstance(b, (list, set, frozenset)) else True
+
+
+# Below this size the numpy round-trip costs more than it saves
+_VEC_MIN_SIZE = 64
+_VEC_OPERATORS = frozenset(("eq", "neq", "gt", "lt", "gte", "lte"))
+
+
+def _vectorized_compare(operator_name, result, expected_value, all_must_match):
+    """Compare a large homogeneous scalar array in vectorized C.
+
+    Returns the pass verdict, or None when the fast path does not apply
+    (numpy missing, small/heterogeneous array, unsupported operator) —
+    the caller then falls back to the per-item loop.
+    """
+    if np is None or operator_name not in _VEC_OPERATORS or len(result) < _VEC_MIN_SIZE:
+        return None
+    first = result[0]
+    if isinstance(first, bool) or not isinstance(first, (int, float, str)):
+        return None
+    try:
+        arr = np.asarray(result)
+        if arr.dtype == object:
+            return None
+        if operator_name == "eq":
+            mask = arr == expected_value
+        elif operator_name == "neq":
+            mask = arr != expected_value
+        elif operator_name == "gt":
+            mask = arr > expected_value
+        elif operator_name == "lt":
+            mask = arr < expected_value
+        elif operator_name == "gte":
+            mask = arr >= expected_value
+        else:
+            mask = arr <= expected_value
+        if not isinstance(mask, np.ndarray):
+            return None  # Incomparable types collapsed to a scalar
+        return bool(mask.all() if all_must_match else mask.any())
+    except (TypeError, ValueError):
+        return None
+
 
 class StructureChecker(RuleChecker):
     """
@@ -17,29 +102,32 @@ class StructureChecker(RuleChecker):
     }
     """
     
+    # Stdlib operator functions where the semantics allow it (C-level,
+    # no lambda frame per element); plain functions where type guards
+    # are part of the contract.
     OPERATORS = {
-        "eq": lambda a, b: a == b,
-        "neq": lambda a, b: a != b,
-        "contains": lambda a, b: b in a if isinstance(a, (str, list)) else False,
-        "not_contains": lambda a, b: b not in a if isinstance(a, (str, list)) else True,
-        "gt": lambda a, b: a > b,
-        "lt": lambda a, b: a < b,
-        "gte": lambda a, b: a >= b,
-        "lte": lambda a, b: a <= b,
-        "exists": lambda a, b: a is not None,
-        "not_exists": lambda a, b: a is None,
-        "in": lambda a, b: a in b if isinstance(b, list) else False,
-        "not_in": lambda a, b: a not in b if isinstance(b, list) else True,
+        "eq": operator.eq,
+        "neq": operator.ne,
+        "contains": _contains,
+        "not_contains": _not_contains,
+        "gt": operator.gt,
+        "lt": operator.lt,
+        "gte": operator.ge,
+        "lte": operator.le,
+        "exists": _exists,
+        "not_exists": _not_exists,
+        "in": _in,
+        "not_in": _not_in,
     }
     
     def validate_payload(self, payload: dict) -> list[str]:
         errors = []
         if "path" not in payload:
             errors.append("'path' is required")
-        operator = payload.get("operator", "eq")
-        if operator not in self.OPERATORS:
+        operator_name = payload.get("operator", "eq")
+        if operator_name not in self.OPERATORS:
             errors.append(f"'operator' must be one of: {list(self.OPERATORS.keys())}")
-        if operator not in ("exists", "not_exists") and "value" not in payload:
+        if operator_name not in ("exists", "not_exists") and "value" not in payload:
             errors.append("'value' is required for this operator")
         return errors
     
@@ -48,22 +136,22 @@ class StructureChecker(RuleChecker):
             return CheckResult.error("Configuration must be a dictionary for structure checks")
         
         path = payload["path"]
-        operator = payload.get("operator", "eq")
+        operator_name = payload.get("operator", "eq")
         expected_value = payload.get("value")
         all_must_match = payload.get("all_must_match", True)
         
         try:
             # Query the configuration
-            result = jmespath.search(path, config)
+            result = _jp_compile(path).search(config)
         except jmespath.exceptions.JMESPathError as e:
             return CheckResult.error(f"Invalid JMESPath: {e}")
         
-        op_func = self.OPERATORS[operator]
+        op_func = self.OPERATORS[operator_name]
         
         # Handle array results
         if isinstance(result, list):
             if not result:
-                if operator in ("exists", "not_exists"):
+                if operator_name in ("exists", "not_exists"):
                     passed = op_func(None, expected_value)
                 else:
                     return CheckResult.failure(
@@ -71,19 +159,37 @@ class StructureChecker(RuleChecker):
                         raw_value=result
                     )
             else:
-                results = [op_func(item, expected_value) for item in result]
-                passed = all(results) if all_must_match else any(results)
+                passed = _vectorized_compare(
+                    operator_name, result, expected_value, all_must_match
+                )
+                if passed is None:
+                    # Set membership beats repeated list scans for in/not_in
+                    compare_value = expected_value
+                    if operator_name in ("in", "not_in") and isinstance(expected_value, list):
+                        try:
+                            compare_value = frozenset(expected_value)
+                        except TypeError:
+                            pass  # Unhashable members — keep the list
+                    try:
+                        matches = (op_func(item, compare_value) for item in result)
+                        passed = all(matches) if all_must_match else any(matches)
+                    except TypeError:
+                        # Unhashable result items (dicts/lists) can't be
+                        # tested against a frozenset — fall back to the
+                        # original list's linear equality scan
+                        matches = (op_func(item, expected_value) for item in result)
+                        passed = all(matches) if all_must_match else any(matches)
         else:
             passed = op_func(result, expected_value)
         
         if passed:
             return CheckResult.success(
-                message=f"Check passed: {path} {operator} {expected_value}",
+                message=f"Check passed: {path} {operator_name} {expected_value}",
                 raw_value=result
             )
         else:
             return CheckResult.failure(
-                message=f"Check failed: expected {path} {operator} {expected_value}",
+                message=f"Check failed: expected {path} {operator_name} {expected_value}",
                 diff_data=f"Actual value: {result}",
                 raw_value=result
             )
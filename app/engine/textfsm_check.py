@@ -5,14 +5,182 @@ into structured tables for validation.
 
 Ideal for checking output of 'show' commands.
 """
+import hashlib
+import io
 import logging
 import re
-from typing import Any
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Optional
 
-from app.engine.base import RuleChecker, CheckResult, CheckStatus
+from app.engine.base import RuleChecker, CheckResult, CheckStatus, compile_user_regex
+
+try:
+    import textfsm
+except ImportError:
+    textfsm = None
+
+try:
+    from ntc_templates import parse as _ntc_parse
+except ImportError:
+    _ntc_parse = None
+
+try:
+    import numpy as np  # Optional — vectorizes numeric on_all checks
+except ImportError:
+    np = None
 
 logger = logging.getLogger(__name__)
 
+# Below this many rows the numpy round-trip costs more than it saves
+_VEC_MIN_ROWS = 64
+_NUMERIC_OPS = frozenset(("gt", "lt", "ge", "le"))
+
+
+def _vectorized_failures(operator, expected, values, limit):
+    """Run a numeric on_all comparison as one C-level array scan.
+
+    Returns up to ``limit`` failing (index, value) pairs, or None when
+    the fast path does not apply (numpy missing, non-numeric column) —
+    the caller then falls back to the per-row loop.
+    """
+    if np is None:
+        return None
+    try:
+        col = np.asarray(values, dtype=np.float64)
+        exp = float(expected)
+    except (TypeError, ValueError):
+        return None
+    if operator == "gt":
+        mask = col > exp
+    elif operator == "lt":
+        mask = col < exp
+    elif operator == "ge":
+        mask = col >= exp
+    else:
+        mask = col <= exp
+    failing = np.flatnonzero(~mask)
+    if failing.size > limit:
+        failing = failing[:limit]
+    return [(int(i), values[i]) for i in failing]
+
+
+def _specialize(op_name: str, expected):
+    """Bind a unary comparator with the expected value pre-coerced.
+
+    The OPERATORS lambdas coerce both sides on every row; here the
+    constant side is converted once per check. Returns None when the
+    expected value cannot be pre-coerced — the caller then falls back
+    to the generic two-argument operator.
+    """
+    try:
+        if op_name == "eq":
+            exp = str(expected)
+            return lambda a: str(a) == exp
+        if op_name == "ne":
+            exp = str(expected)
+            return lambda a: str(a) != exp
+        if op_name == "contains":
+            exp = str(expected)
+            return lambda a: exp in str(a)
+        if op_name == "not_contains":
+            exp = str(expected)
+            return lambda a: exp not in str(a)
+        if op_name == "regex":
+            rex = compile_user_regex(expected)
+            return lambda a: rex.search(str(a)) is not None
+        if op_name in ("gt", "lt", "ge", "le"):
+            exp = float(expected)
+            if op_name == "gt":
+                return lambda a: float(a) > exp
+            if op_name == "lt":
+                return lambda a: float(a) < exp
+            if op_name == "ge":
+                return lambda a: float(a) >= exp
+            return lambda a: float(a) <= exp
+    except (TypeError, ValueError, re.error):
+        return None
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class _TextFSMPlan:
+    """A payload precompiled for execution.
+
+    The payload of a rule never changes between devices, yet check()
+    used to re-resolve operators, re-specialize comparators and
+    re-compile the row filter for every config scanned. The plan does
+    that work once; check() only executes it.
+    """
+
+    # (field, operator, expected, comparator, on_all) per valid check
+    checks: tuple
+    # (field, compiled pattern) or None
+    row_filter: Optional[tuple]
+    min_rows: Optional[int]
+    max_rows: Optional[int]
+    max_failures: int
+    stop_on_first: bool
+    needs_all_rows: bool
+
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _plan_key(payload: dict) -> tuple:
+    """Stable cache key over the payload fields the plan depends on."""
+    row_filter = payload.get("row_filter") or {}
+    return (
+        tuple(
+            (c.get("field"), c.get("operator"), _hashable(c.get("value")), bool(c.get("on_all")))
+            for c in payload.get("checks", ())
+        ),
+        row_filter.get("field"),
+        row_filter.get("pattern"),
+        payload.get("min_rows"),
+        payload.get("max_rows"),
+        payload.get("max_failures", 200),
+        payload.get("stop_on_first_failure", False),
+    )
+
+
+# The same show-command output is often checked by several rules;
+# parse_output loads and runs the template each time, so memoize on the
+# output's digest (bounded LRU — configs are too large to key directly)
+_NTC_CACHE: OrderedDict = OrderedDict()
+_NTC_CACHE_MAX = 512
+
+
+def _ntc_parse_output(platform: str, command: str, data: str) -> list[dict]:
+    key = (platform, command, hashlib.blake2b(data.encode(), digest_size=16).digest())
+    cached = _NTC_CACHE.get(key)
+    if cached is None:
+        cached = _ntc_parse.parse_output(platform=platform, command=command, data=data)
+        _NTC_CACHE[key] = cached
+        if len(_NTC_CACHE) > _NTC_CACHE_MAX:
+            _NTC_CACHE.popitem(last=False)
+    else:
+        _NTC_CACHE.move_to_end(key)
+    return cached
+
+
+@lru_cache(maxsize=256)
+def _compiled_template(template_content: str):
+    """Compile a TextFSM template once per unique content.
+
+    A scan runs the same rule template against every device, so the
+    grammar is tokenized once instead of per config — the StringIO
+    wrapper only ever exists here (TextFSM requires a file-like
+    object). ParseText mutates the FSM, hence the per-entry lock and
+    Reset before each parse.
+    """
+    fsm = textfsm.TextFSM(io.StringIO(template_content))
+    return fsm, tuple(fsm.header), threading.Lock()
+
 
 class TextFSMChecker(RuleChecker):
     """
@@ -38,18 +206,22 @@ class TextFSMChecker(RuleChecker):
             "pattern": "filter_regex"
         },
         "min_rows": 1,  # Minimum number of parsed rows
-        "max_rows": null  # Maximum number of parsed rows
+        "max_rows": null,  # Maximum number of parsed rows
+        "max_failures": 200,  # Stop collecting failures past this count
+        "stop_on_first_failure": false  # Abort remaining checks on first failure
     }
     """
     
     LOGIC_TYPE = "textfsm_check"
-    
+
+    _PLAN_CACHE_MAX = 128
+
     OPERATORS = {
         "eq": lambda a, b: str(a) == str(b),
         "ne": lambda a, b: str(a) != str(b),
         "contains": lambda a, b: str(b) in str(a),
         "not_contains": lambda a, b: str(b) not in str(a),
-        "regex": lambda a, b: bool(re.search(b, str(a))),
+        "regex": lambda a, b: compile_user_regex(b).search(str(a)) is not None,
         "gt": lambda a, b: float(a) > float(b),
         "lt": lambda a, b: float(a) < float(b),
         "ge": lambda a, b: float(a) >= float(b),
@@ -59,7 +231,69 @@ class TextFSMChecker(RuleChecker):
         "empty": lambda a, b: not a or a == "",
         "not_empty": lambda a, b: a and a != "",
     }
-    
+
+    def __init__(self):
+        # One checker instance serves every rule (evaluator reuses
+        # instances), so plans for the active rule set stay warm here
+        self._plan_cache: OrderedDict = OrderedDict()
+
+    def _plan_for(self, payload: dict) -> _TextFSMPlan:
+        """Return the compiled plan for a payload (bounded LRU)."""
+        try:
+            key = _plan_key(payload)
+            plan = self._plan_cache.get(key)
+        except TypeError:
+            # Unhashable payload value — compile without caching
+            return self._build_plan(payload)
+        if plan is None:
+            plan = self._build_plan(payload)
+            self._plan_cache[key] = plan
+            if len(self._plan_cache) > self._PLAN_CACHE_MAX:
+                self._plan_cache.popitem(last=False)
+        else:
+            self._plan_cache.move_to_end(key)
+        return plan
+
+    def _build_plan(self, payload: dict) -> _TextFSMPlan:
+        compiled = []
+        for check in payload.get("checks", []):
+            operator = check.get("operator")
+            op_func = self.OPERATORS.get(operator)
+            if op_func is None:
+                continue
+            expected = check.get("value")
+            # Unary comparator with the constant side coerced once
+            cmp = _specialize(operator, expected)
+            if cmp is None:
+                cmp = lambda a, _op=op_func, _exp=expected: _op(a, _exp)
+            compiled.append(
+                (check.get("field"), operator, expected, cmp, check.get("on_all", False))
+            )
+
+        row_filter = payload.get("row_filter")
+        if row_filter:
+            row_filter = (
+                row_filter.get("field"),
+                compile_user_regex(row_filter.get("pattern", "")),
+            )
+        else:
+            row_filter = None
+
+        min_rows = payload.get("min_rows")
+        max_rows = payload.get("max_rows")
+        return _TextFSMPlan(
+            checks=tuple(compiled),
+            row_filter=row_filter,
+            min_rows=min_rows,
+            max_rows=max_rows,
+            max_failures=payload.get("max_failures", 200),
+            stop_on_first=payload.get("stop_on_first_failure", False),
+            # When nothing looks past row 0, row 0 is all check() keeps
+            needs_all_rows=bool(
+                row_filter or min_rows or max_rows or any(c[4] for c in compiled)
+            ),
+        )
+
     def validate_payload(self, payload: dict) -> list[str]:
         """Validate checker payload."""
         errors = []
@@ -118,26 +352,36 @@ class TextFSMChecker(RuleChecker):
         """
         Parse CLI output with TextFSM and validate.
         """
-        try:
-            import textfsm
-        except ImportError:
+        if textfsm is None:
             return CheckResult.error(
                 message="textfsm not installed. pip install textfsm"
             )
-        
+
         template_content = payload.get("template")
         template_name = payload.get("template_name")
-        
+
+        # Operators, comparators and the row filter are resolved once
+        # per payload, not once per config
+        try:
+            plan = self._plan_for(payload)
+        except Exception as e:
+            return CheckResult.error(
+                message=f"Payload compilation failed: {e}"
+            )
+
         # Get template
         if template_name:
             # Try ntc-templates
+            if _ntc_parse is None:
+                return CheckResult.error(
+                    message=f"Failed to use template '{template_name}': ntc-templates not installed"
+                )
             try:
-                from ntc_templates import parse
-                parsed = parse.parse_output(platform=template_name.rsplit("_", 1)[0], 
-                                           command=template_name.split("_")[-1], 
+                parsed = _ntc_parse_output(platform=template_name.rsplit("_", 1)[0],
+                                           command=template_name.split("_")[-1],
                                            data=config_text)
                 if parsed:
-                    return self._validate_parsed_data(parsed, payload)
+                    return self._validate_parsed_data(parsed, plan)
             except Exception as e:
                 logger.warning(f"NTC-templates failed: {e}")
                 return CheckResult.error(
@@ -149,76 +393,134 @@ class TextFSMChecker(RuleChecker):
                 message="No template content provided"
             )
         
-        # Parse with TextFSM
+        # Parse with TextFSM (template compiled once per unique content)
         try:
-            import io
-            template_file = io.StringIO(template_content)
-            fsm = textfsm.TextFSM(template_file)
-            parsed = fsm.ParseText(config_text)
-            
-            # Convert to list of dicts
-            headers = fsm.header
-            data = [dict(zip(headers, row)) for row in parsed]
-            
-            return self._validate_parsed_data(data, payload)
+            fsm, headers, lock = _compiled_template(template_content)
+            with lock:
+                fsm.Reset()
+                parsed = fsm.ParseText(config_text)
+
+            # Rows stay in TextFSM's native list form — fields resolve
+            # to column indexes in _validate_parsed_data, so no dict is
+            # ever built per row
+            total_rows = len(parsed)
+            data = parsed if plan.needs_all_rows else parsed[:1]
+
+            return self._validate_parsed_data(
+                data, plan, total_rows=total_rows, headers=headers
+            )
             
         except Exception as e:
             return CheckResult.error(
                 message=f"TextFSM parsing failed: {e}"
             )
     
-    def _validate_parsed_data(self, data: list[dict], payload: dict) -> CheckResult:
-        """Validate parsed data against checks."""
-        # Apply row filter
-        row_filter = payload.get("row_filter")
-        if row_filter:
-            field = row_filter.get("field")
-            pattern = row_filter.get("pattern", "")
-            data = [row for row in data if re.search(pattern, str(row.get(field, "")))]
-        
+    def _validate_parsed_data(
+        self,
+        data: list,
+        plan: _TextFSMPlan,
+        total_rows: int | None = None,
+        headers: tuple | None = None,
+    ) -> CheckResult:
+        """Validate parsed data against a compiled plan.
+
+        Rows are dicts (ntc-templates path) or plain lists in header
+        order (textfsm path, `headers` given) — field access is resolved
+        to a per-check accessor so the row loops don't care which.
+        """
+        if headers is not None:
+            col_idx = {h: i for i, h in enumerate(headers)}
+
+            def accessor(field):
+                idx = col_idx.get(field)
+                if idx is None:
+                    return lambda row: ""
+                return lambda row: row[idx]
+        else:
+            def accessor(field):
+                return lambda row: row.get(field, "")
+
+        min_rows = plan.min_rows
+        max_rows = plan.max_rows
+
+        # Apply row filter — fused with the max_rows cap: once the cap
+        # is exceeded the result is a failure regardless of how many
+        # more rows would match, so stop filtering at max_rows + 1
+        # instead of scanning a huge table to completion
+        if plan.row_filter is not None:
+            filter_field, filter_re = plan.row_filter
+            get_value = accessor(filter_field)
+            matched = (row for row in data if filter_re.search(str(get_value(row))))
+            if max_rows:
+                data = list(islice(matched, max_rows + 1))
+                if len(data) > max_rows:
+                    return CheckResult.failure(
+                        message=f"Expected at most {max_rows} rows, got more"
+                    )
+            else:
+                data = list(matched)
+            total_rows = len(data)
+
         # Check row count
-        min_rows = payload.get("min_rows")
-        max_rows = payload.get("max_rows")
-        
         if min_rows and len(data) < min_rows:
             return CheckResult.failure(
                 message=f"Expected at least {min_rows} rows, got {len(data)}"
             )
-        
+
         if max_rows and len(data) > max_rows:
             return CheckResult.failure(
                 message=f"Expected at most {max_rows} rows, got {len(data)}"
             )
         
-        # Run checks
+        # Run checks. Only the first few failures are ever reported, so
+        # stop collecting (and formatting) once the cap is reached.
         failures = []
-        checks = payload.get("checks", [])
-        
-        for check in checks:
-            field = check.get("field")
-            operator = check.get("operator")
-            expected = check.get("value")
-            on_all = check.get("on_all", False)
-            
-            op_func = self.OPERATORS.get(operator)
-            if not op_func:
-                continue
-            
+        truncated = False
+        max_failures = plan.max_failures
+        stop_on_first = plan.stop_on_first
+
+        for field, operator, expected, cmp, on_all in plan.checks:
+            if failures and (stop_on_first or truncated):
+                break
+
+            get_value = accessor(field)
+
+            if on_all and operator in _NUMERIC_OPS and len(data) >= _VEC_MIN_ROWS:
+                values = [get_value(row) for row in data]
+                vec = _vectorized_failures(
+                    operator, expected, values, max_failures - len(failures)
+                )
+                if vec is not None:
+                    for i, actual in vec:
+                        failures.append(
+                            f"Row {i}: {field}='{actual}' failed {operator} '{expected}'"
+                        )
+                    if len(failures) >= max_failures:
+                        truncated = True
+                    continue
+
             if on_all:
-                # Check all rows
+                # Check all rows — bind loop invariants to locals so the
+                # per-row cost is one field access and one comparator
+                # call; failure strings are only built for failing rows
                 for i, row in enumerate(data):
-                    actual = row.get(field, "")
+                    actual = get_value(row)
                     try:
-                        if not op_func(actual, expected):
-                            failures.append(f"Row {i}: {field}='{actual}' failed {operator} '{expected}'")
+                        if not cmp(actual):
+                            failures.append(
+                                f"Row {i}: {field}='{actual}' failed {operator} '{expected}'"
+                            )
                     except Exception as e:
                         failures.append(f"Row {i}: check error - {e}")
+                    if len(failures) >= max_failures:
+                        truncated = True
+                        break
             else:
                 # Check first matching row
                 if data:
-                    actual = data[0].get(field, "")
+                    actual = get_value(data[0])
                     try:
-                        if not op_func(actual, expected):
+                        if not cmp(actual):
                             failures.append(f"{field}='{actual}' failed {operator} '{expected}'")
                     except Exception as e:
                         failures.append(f"Check error: {e}")
@@ -226,11 +528,16 @@ class TextFSMChecker(RuleChecker):
                     failures.append(f"No data rows to check")
         
         if failures:
+            if truncated:
+                failures.append(f"... further failures truncated at {max_failures}")
+            # The message carries the first five failures; only build
+            # the full diff blob when it would add anything beyond them
             return CheckResult.failure(
                 message="; ".join(failures[:5]),  # Limit messages
-                diff_data="\n".join(failures)
+                diff_data="\n".join(failures) if len(failures) > 5 else None
             )
         
+        rows = total_rows if total_rows is not None else len(data)
         return CheckResult.success(
-            message=f"All {len(checks)} checks passed on {len(data)} rows"
+            message=f"All {len(plan.checks)} checks passed on {rows} rows"
         )
@@ -6,13 +6,84 @@ Useful for:
 - Compliance with security patches
 """
 import logging
+import operator as _operator
 import re
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Optional
 
-from app.engine.base import RuleChecker, CheckResult, CheckStatus
+from app.engine.base import RuleChecker, CheckResult, CheckStatus, compile_user_regex
 
 logger = logging.getLogger(__name__)
 
+# A policy often carries several version rules sharing one extraction
+# pattern (same "^version (\S+)" with different operators/values), so
+# each distinct (pattern, config) pair is searched once per scan. str
+# caches its hash after the first computation, so repeat keys are cheap.
+_SEARCH_CACHE: OrderedDict = OrderedDict()
+_SEARCH_CACHE_MAX = 128
+
+
+def _search_cached(pattern: str, config_text: str):
+    """First match of a version pattern in a config, memoized."""
+    key = (pattern, len(config_text), hash(config_text))
+    if key in _SEARCH_CACHE:
+        _SEARCH_CACHE.move_to_end(key)
+        return _SEARCH_CACHE[key]
+    match = compile_user_regex(pattern, re.MULTILINE | re.IGNORECASE).search(config_text)
+    _SEARCH_CACHE[key] = match
+    if len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX:
+        _SEARCH_CACHE.popitem(last=False)
+    return match
+
+@lru_cache(maxsize=4096)
+def _parse_version(version: Optional[str], format_type: str = "auto") -> tuple:
+    """Parse version string into comparable tuple.
+
+    Pure function of its input — cached because the expected/min/max
+    versions of a rule are re-parsed for every config scanned. One
+    character scan: parts split on ./-/_ and each part contributes its
+    leading number (or 0).
+    """
+    if not version:
+        return (0,)
+
+    version = version.strip()
+    # Remove common prefixes
+    if version[:1] in ("v", "V"):
+        version = version[1:]
+    if not version:
+        return (0,)
+
+    result = []
+    num = 0
+    seen_digit = False
+    leading = True  # Still inside the part's leading number
+    for ch in version:
+        if ch in ".-_":
+            result.append(num if seen_digit else 0)
+            num = 0
+            seen_digit = False
+            leading = True
+        elif leading and "0" <= ch <= "9":
+            num = num * 10 + (ord(ch) - 48)
+            seen_digit = True
+        else:
+            leading = False
+    result.append(num if seen_digit else 0)
+
+    return tuple(result)
+
+# One C-level comparison per check instead of evaluating all six
+_COMPARISONS = {
+    "eq": _operator.eq,
+    "ne": _operator.ne,
+    "gt": _operator.gt,
+    "lt": _operator.lt,
+    "ge": _operator.ge,
+    "le": _operator.le,
+}
+
 
 class VersionChecker(RuleChecker):
     """
@@ -85,9 +156,10 @@ class VersionChecker(RuleChecker):
         expected = payload.get("value")
         version_format = payload.get("version_format", "auto")
         
-        # Extract version
+        # Extract version (pattern compiled once per rule; the search
+        # itself memoized per pattern+config across rules)
         try:
-            match = re.search(pattern, config_text, re.MULTILINE | re.IGNORECASE)
+            match = _search_cached(pattern, config_text)
             if not match:
                 return CheckResult.failure(
                     message="Version pattern not found"
@@ -100,12 +172,12 @@ class VersionChecker(RuleChecker):
             )
         
         # Parse versions
-        actual_parsed = self._parse_version(actual_version, version_format)
-        
+        actual_parsed = _parse_version(actual_version, version_format)
+
         # Compare
         if operator == "in_range":
-            min_ver = self._parse_version(payload.get("min_version"), version_format)
-            max_ver = self._parse_version(payload.get("max_version"), version_format)
+            min_ver = _parse_version(payload.get("min_version"), version_format)
+            max_ver = _parse_version(payload.get("max_version"), version_format)
             
             if min_ver <= actual_parsed <= max_ver:
                 return CheckResult.success(
@@ -118,18 +190,10 @@ class VersionChecker(RuleChecker):
                     diff_data=f"Actual: {actual_version}, Expected range: [{payload['min_version']}, {payload['max_version']}]"
                 )
         
-        expected_parsed = self._parse_version(expected, version_format)
-        
-        comparisons = {
-            "eq": actual_parsed == expected_parsed,
-            "ne": actual_parsed != expected_parsed,
-            "gt": actual_parsed > expected_parsed,
-            "lt": actual_parsed < expected_parsed,
-            "ge": actual_parsed >= expected_parsed,
-            "le": actual_parsed <= expected_parsed,
-        }
-        
-        passed = comparisons.get(operator, False)
+        expected_parsed = _parse_version(expected, version_format)
+
+        cmp_func = _COMPARISONS.get(operator)
+        passed = cmp_func(actual_parsed, expected_parsed) if cmp_func else False
         
         if passed:
             return CheckResult.success(
@@ -142,26 +206,3 @@ class VersionChecker(RuleChecker):
                 diff_data=f"Actual: {actual_version}, Expected: {operator} {expected}",
                 raw_value=actual_version
             )
-    
-    def _parse_version(self, version: str, format_type: str = "auto") -> tuple:
-        """Parse version string into comparable tuple."""
-        if not version:
-            return (0,)
-        
-        # Remove common prefixes
-        version = re.sub(r'^[vV]', '', version.strip())
-        
-        # Split by common separators
-        parts = re.split(r'[.\-_]', version)
-        
-        # Convert to integers where possible
-        result = []
-        for part in parts:
-            # Extract leading number
-            match = re.match(r'(\d+)', part)
-            if match:
-                result.append(int(match.group(1)))
-            else:
-                result.append(0)
-        
-        return tuple(result) if result else (0,)
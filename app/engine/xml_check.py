@@ -6,14 +6,170 @@ Supports:
 - Multiple validation operators
 - NETCONF response validation
 """
+import hashlib
+import io
 import logging
+import operator as _operator
 import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any, Optional
 
-from app.engine.base import RuleChecker, CheckResult, CheckStatus
+from app.engine.base import RuleChecker, CheckResult, CheckStatus, compile_user_regex
 
 logger = logging.getLogger(__name__)
 
+def _strip_xml_decl(config_bytes: bytes) -> bytes:
+    """Drop the XML declaration, if present, without the regex engine.
+
+    The prolog can only sit at offset 0 and ends at the first ``?>``,
+    so a startswith + find slice (both single C passes) replaces the
+    previous re.sub over the whole document.
+    """
+    if config_bytes.startswith(b"<?xml"):
+        end = config_bytes.find(b"?>", 5)
+        if end != -1:
+            config_bytes = config_bytes[end + 2:]
+    return config_bytes.strip()
+
+try:
+    from lxml import etree
+    _HAVE_LXML = True
+except ImportError:
+    # Fallback to stdlib
+    from xml.etree import ElementTree as etree
+    _HAVE_LXML = False
+    logger.warning("lxml not installed, using stdlib (limited XPath)")
+
+
+# One C-level comparison for the count operators, with the expected
+# count converted once instead of inside a lambda per call
+_COUNT_COMPARISONS = {
+    "count_eq": _operator.eq,
+    "count_gt": _operator.gt,
+    "count_lt": _operator.lt,
+    "count_ge": _operator.ge,
+    "count_le": _operator.le,
+}
+
+
+def _specialize_value(op_name: str, expected):
+    """Bind a unary comparator with the expected value pre-coerced.
+
+    The VALUE_OPERATORS lambdas coerce both sides on every element;
+    here the constant side is converted once per check. Returns None
+    when the expected value cannot be pre-coerced — the caller then
+    falls back to the generic two-argument operator.
+    """
+    try:
+        if op_name == "eq":
+            exp = str(expected)
+            return lambda a: str(a) == exp
+        if op_name == "ne":
+            exp = str(expected)
+            return lambda a: str(a) != exp
+        if op_name == "contains":
+            exp = str(expected)
+            return lambda a: exp in str(a)
+        if op_name == "not_contains":
+            exp = str(expected)
+            return lambda a: exp not in str(a)
+        if op_name == "starts_with":
+            exp = str(expected)
+            return lambda a: str(a).startswith(exp)
+        if op_name == "ends_with":
+            exp = str(expected)
+            return lambda a: str(a).endswith(exp)
+        if op_name == "regex":
+            rex = compile_user_regex(expected)
+            return lambda a: rex.search(str(a)) is not None
+        if op_name in ("gt", "lt", "ge", "le"):
+            exp = float(expected)
+            if op_name == "gt":
+                return lambda a: float(a) > exp
+            if op_name == "lt":
+                return lambda a: float(a) < exp
+            if op_name == "ge":
+                return lambda a: float(a) >= exp
+            return lambda a: float(a) <= exp
+    except (TypeError, ValueError, re.error):
+        return None
+    return None
+
+
+# lxml's default parser collects IDs and keeps whitespace-only text
+# nodes and comments; none of that is needed to run XPath checks over
+# NETCONF payloads, and a smaller tree also speeds later traversals.
+# resolve_entities=False hardens against XXE. Parser objects are not
+# safe for concurrent use (the composite checker runs sub-checkers on
+# threads), so each thread keeps its own.
+_parser_local = threading.local()
+
+
+def _xml_parser():
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None and _HAVE_LXML:
+        parser = _parser_local.parser = etree.XMLParser(
+            remove_blank_text=True,
+            remove_comments=True,
+            collect_ids=False,
+            huge_tree=False,
+            resolve_entities=False,
+        )
+    return parser
+
+
+# Streaming fast path: documents at least this large, whose checks are
+# all plain descendant selectors, are matched with iterparse instead of
+# a full DOM — peak memory drops from O(document) to O(nodeset).
+# Smaller documents keep the cached-tree path, which is faster when
+# many rules hit the same response.
+_STREAM_MIN_BYTES = 8 * 1024 * 1024
+
+# //tag or //prefix:tag, nothing else (no predicates, no nesting)
+_STREAMABLE_XPATH_RE = re.compile(r"^//\w+(?::\w+)?$")
+
+
+# An evaluator runs many XML rules against the same device response;
+# caching the parsed tree by content digest turns N full parses into
+# one (bounded LRU — documents are too large to key directly). Cached
+# trees are shared between rules, so checkers must treat them as
+# read-only: every operator here only queries elements, never mutates.
+_TREE_CACHE: OrderedDict = OrderedDict()
+_TREE_CACHE_MAX = 64
+
+
+def _parse_xml_cached(config_bytes: bytes):
+    key = hashlib.blake2b(config_bytes, digest_size=16).digest()
+    root = _TREE_CACHE.get(key)
+    if root is None:
+        parser = _xml_parser()
+        if parser is not None:
+            root = etree.fromstring(config_bytes, parser)
+        elif hasattr(etree, 'fromstring'):
+            root = etree.fromstring(config_bytes)
+        else:
+            root = etree.XML(config_bytes)
+        _TREE_CACHE[key] = root
+        if len(_TREE_CACHE) > _TREE_CACHE_MAX:
+            _TREE_CACHE.popitem(last=False)
+    else:
+        _TREE_CACHE.move_to_end(key)
+    return root
+
+
+@lru_cache(maxsize=512)
+def _compile_xpath(expr: str, ns_items: tuple = ()):
+    """Compile an XPath expression once per (expression, namespaces) pair.
+
+    lxml parses the expression into an evaluator object on every
+    root.xpath() call; rule expressions are stable, so compiling them
+    once and reusing the etree.XPath evaluator across configs skips
+    that parse. Namespaces are passed as sorted items to stay hashable.
+    """
+    return etree.XPath(expr, namespaces=dict(ns_items) if ns_items else None)
+
 
 class XMLChecker(RuleChecker):
     """
@@ -60,7 +216,7 @@ class XMLChecker(RuleChecker):
         "ne": lambda actual, expected: str(actual) != str(expected),
         "contains": lambda actual, expected: str(expected) in str(actual),
         "not_contains": lambda actual, expected: str(expected) not in str(actual),
-        "regex": lambda actual, expected: bool(re.search(expected, str(actual))),
+        "regex": lambda actual, expected: compile_user_regex(expected).search(str(actual)) is not None,
         "starts_with": lambda actual, expected: str(actual).startswith(str(expected)),
         "ends_with": lambda actual, expected: str(actual).endswith(str(expected)),
         "gt": lambda actual, expected: float(actual) > float(expected),
@@ -82,10 +238,20 @@ class XMLChecker(RuleChecker):
             errors.append("'xpath' or 'checks' array is required")
             return errors
         
+        ns_items = tuple(sorted(payload.get("namespaces", {}).items()))
+
         for i, check in enumerate(checks):
-            if not check.get("xpath"):
+            xpath = check.get("xpath")
+            if not xpath:
                 errors.append(f"Check {i}: 'xpath' is required")
-            
+            elif _HAVE_LXML:
+                # Precompile so syntax errors surface at rule-save time
+                # instead of per device during a scan
+                try:
+                    _compile_xpath(xpath, ns_items)
+                except Exception as e:
+                    errors.append(f"Check {i}: invalid XPath '{xpath}': {e}")
+
             operator = check.get("operator", "exists")
             all_ops = set(self.OPERATORS.keys()) | set(self.VALUE_OPERATORS.keys())
             if operator not in all_ops:
@@ -130,40 +296,46 @@ class XMLChecker(RuleChecker):
         """
         Parse XML and validate with XPath.
         """
-        try:
-            from lxml import etree
-        except ImportError:
-            # Fallback to stdlib
-            from xml.etree import ElementTree as etree
-            logger.warning("lxml not installed, using stdlib (limited XPath)")
-        
+        # Get namespaces
+        namespaces = payload.get("namespaces", {})
+
+        # Get checks
+        checks = payload.get("checks", [])
+        if not checks and payload.get("xpath"):
+            checks = [payload]
+
+        # Rule packs often pair a count check and a value check on the
+        # same expression — memoize each distinct XPath's nodeset so it
+        # is evaluated once per document, not once per check
+        elements_cache: dict = {}
+
         # Parse XML
         try:
             # Remove XML declaration if present (common issue)
-            config_clean = re.sub(r'<\?xml[^?]*\?>', '', config_text).strip()
-            
-            if hasattr(etree, 'fromstring'):
-                root = etree.fromstring(config_clean.encode('utf-8'))
-            else:
-                root = etree.XML(config_clean)
-                
+            config_bytes = _strip_xml_decl(config_text.encode('utf-8'))
+
+            # Large documents whose checks are all simple descendant
+            # selectors stream through iterparse, pre-filling the
+            # nodeset memo without ever holding the full tree
+            root = None
+            if len(config_bytes) >= _STREAM_MIN_BYTES:
+                streamed = self._stream_elements(config_bytes, checks, namespaces)
+                if streamed is not None:
+                    root, elements_cache = streamed
+
+            if root is None:
+                # Cached — N XML rules on one response share a tree
+                root = _parse_xml_cached(config_bytes)
+
         except Exception as e:
             return CheckResult.error(
                 message=f"XML parse error: {e}"
             )
-        
-        # Get namespaces
-        namespaces = payload.get("namespaces", {})
-        
-        # Get checks
-        checks = payload.get("checks", [])
-        if not checks and payload.get("xpath"):
-            checks = [payload]
-        
+
         failures = []
-        
+
         for check in checks:
-            result = self._run_check(root, check, namespaces)
+            result = self._run_check(root, check, namespaces, elements_cache)
             if not result.passed:
                 failures.append(result.message)
         
@@ -177,35 +349,120 @@ class XMLChecker(RuleChecker):
             message=f"All {len(checks)} XPath checks passed"
         )
     
-    def _run_check(self, root, check: dict, namespaces: dict) -> CheckResult:
-        """Run a single XPath check."""
+    @staticmethod
+    def _stream_tags(checks: list, namespaces: dict) -> Optional[dict]:
+        """Map each check's xpath to an iterparse tag name.
+
+        Returns None when any xpath is more than a bare descendant
+        selector (predicates, nesting, unknown prefix) — those need the
+        full DOM.
+        """
+        tags = {}
+        for check in checks:
+            xpath = check.get("xpath") or ""
+            if not _STREAMABLE_XPATH_RE.match(xpath):
+                return None
+            name = xpath[2:]
+            if ":" in name:
+                prefix, local = name.split(":", 1)
+                uri = namespaces.get(prefix)
+                if not uri:
+                    return None
+                tags[xpath] = f"{{{uri}}}{local}"
+            else:
+                tags[xpath] = name
+        return tags
+
+    def _stream_elements(self, config_bytes: bytes, checks: list, namespaces: dict):
+        """Collect matching elements with iterparse instead of a DOM.
+
+        Non-matching elements are cleared as soon as their end tag is
+        seen, so only the matched nodeset (plus the hollowed ancestor
+        spine) stays in memory. Returns (root, nodeset memo) or None
+        when the payload cannot be streamed.
+        """
+        tags = self._stream_tags(checks, namespaces)
+        if not tags:
+            return None
+
+        wanted: dict = {}
+        for xpath, tag in tags.items():
+            wanted.setdefault(tag, []).append(xpath)
+        cache: dict = {xpath: [] for xpath in tags}
+
+        if _HAVE_LXML:
+            # Same hardening as _xml_parser() — the streaming path must
+            # not hand large documents a weaker parser than the DOM path
+            # (entity resolution off closes XXE)
+            context = etree.iterparse(
+                io.BytesIO(config_bytes), events=("end",),
+                resolve_entities=False,
+                remove_comments=True,
+                collect_ids=False,
+                huge_tree=False,
+            )
+        else:
+            context = etree.iterparse(io.BytesIO(config_bytes), events=("end",))
+        for _event, elem in context:
+            xpaths = wanted.get(elem.tag)
+            if xpaths is not None:
+                for xpath in xpaths:
+                    cache[xpath].append(elem)
+            else:
+                # Matched descendants were collected before this end
+                # event fired; clearing here only drops the tree's own
+                # references, not the collected elements themselves
+                elem.clear()
+
+        return context.root, cache
+
+    def _run_check(
+        self, root, check: dict, namespaces: dict,
+        elements_cache: dict | None = None,
+    ) -> CheckResult:
+        """Run a single XPath check.
+
+        `elements_cache` memoizes nodesets by expression within one
+        document (namespaces are payload-level, so the expression alone
+        is a sufficient key).
+        """
         xpath = check.get("xpath")
         operator = check.get("operator", "exists")
         expected = check.get("value")
         attribute = check.get("attribute")
         check_all = check.get("check_all", False)
-        
-        try:
-            # Execute XPath
-            if hasattr(root, 'xpath'):
-                # lxml
-                elements = root.xpath(xpath, namespaces=namespaces)
-            else:
-                # stdlib - limited XPath support
-                elements = root.findall(xpath, namespaces)
-        except Exception as e:
-            return CheckResult.error(
-                message=f"XPath error '{xpath}': {e}"
-            )
+
+        elements = elements_cache.get(xpath) if elements_cache is not None else None
+        if elements is None:
+            try:
+                # Execute XPath (evaluator compiled once per expression)
+                if _HAVE_LXML and hasattr(root, 'xpath'):
+                    # lxml
+                    elements = _compile_xpath(xpath, tuple(sorted(namespaces.items())))(root)
+                else:
+                    # stdlib - limited XPath support
+                    elements = root.findall(xpath, namespaces)
+            except Exception as e:
+                return CheckResult.error(
+                    message=f"XPath error '{xpath}': {e}"
+                )
+            if elements_cache is not None:
+                elements_cache[xpath] = elements
         
         # Count-based operators
         if operator in self.OPERATORS:
-            op_func = self.OPERATORS[operator]
-            if op_func(elements, expected):
+            count = len(elements)
+            if operator == "exists":
+                passed = count > 0
+            elif operator == "not_exists":
+                passed = count == 0
+            else:
+                passed = _COUNT_COMPARISONS[operator](count, int(expected))
+            if passed:
                 return CheckResult.success(message="OK")
             else:
                 return CheckResult.failure(
-                    message=f"XPath '{xpath}': {operator} failed (found {len(elements)} elements)"
+                    message=f"XPath '{xpath}': {operator} failed (found {count} elements)"
                 )
         
         # Value-based operators
@@ -215,18 +472,47 @@ class XMLChecker(RuleChecker):
                     message=f"XPath '{xpath}': no elements found"
                 )
             
-            op_func = self.VALUE_OPERATORS[operator]
-            
-            failed_elements = []
-            for elem in elements:
-                # Get value
+            # Unary comparator with the constant side coerced once
+            cmp = _specialize_value(operator, expected)
+            if cmp is None:
+                op_func = self.VALUE_OPERATORS[operator]
+                cmp = lambda a, _op=op_func, _exp=expected: _op(a, _exp)
+
+            # lxml can project every candidate value in one C-level
+            # XPath evaluation instead of touching .text/.attrib from
+            # Python per element. The projection silently drops elements
+            # lacking the text/attribute node, so it is only trusted
+            # when the counts line up; otherwise the per-element loop
+            # keeps the exact old semantics (missing attribute -> "").
+            values = None
+            if _HAVE_LXML and hasattr(root, 'xpath'):
+                projection = f"({xpath})/@{attribute}" if attribute else f"({xpath})/text()"
+                try:
+                    projected = _compile_xpath(
+                        projection, tuple(sorted(namespaces.items()))
+                    )(root)
+                    if len(projected) == len(elements):
+                        values = projected
+                except Exception:
+                    values = None
+
+            if values is None:
                 if attribute:
-                    actual = elem.get(attribute, "") if hasattr(elem, 'get') else elem.attrib.get(attribute, "")
+                    values = [
+                        elem.get(attribute, "") if hasattr(elem, 'get')
+                        else elem.attrib.get(attribute, "")
+                        for elem in elements
+                    ]
                 else:
-                    actual = elem.text if hasattr(elem, 'text') else str(elem)
-                
+                    values = [
+                        elem.text if hasattr(elem, 'text') else str(elem)
+                        for elem in elements
+                    ]
+
+            failed_elements = []
+            for actual in values:
                 try:
-                    if not op_func(actual, expected):
+                    if not cmp(actual):
                         failed_elements.append(f"'{actual}' {operator} '{expected}'")
                         if not check_all:
                             break
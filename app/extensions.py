@@ -1,4 +1,7 @@
 """Flask extensions initialization."""
+import secrets
+
+from flask import request, jsonify, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from celery import Celery
@@ -7,6 +10,18 @@ db = SQLAlchemy()
 migrate = Migrate()
 celery = Celery()
 
+# CSRF gate constants (see init_csrf)
+SAFE_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+# token_urlsafe(32) is 43 chars; 64 covers legacy token_hex(32)
+# cookies already held by clients (only regenerated when absent)
+TOKEN_LENGTHS = frozenset((43, 64))
+
+# Exact-match paths exempt from CSRF — monitoring endpoints that
+# external probes hit without cookies. Register new skips here instead
+# of editing the gate itself.
+SKIP_PATHS = frozenset({"/health", "/metrics", "/api/health"})
+
 
 def init_celery(app):
     """Initialize Celery with Flask app context."""
@@ -60,49 +75,27 @@ def init_csrf(app):
       X-CSRF-Token header matching the cookie value.
     - Safe methods (GET/HEAD/OPTIONS) are always allowed.
     """
-    import secrets
-    from flask import request, jsonify
-
-    SAFE_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
-
     @app.before_request
-    def ensure_csrf_cookie():
-        """If no csrf_token cookie exists, generate and inject one.
-        
-        This ensures the cookie is available for the first request.
-        The cookie will be set on the response via after_request.
+    def csrf_gate():
+        """Ensure the cookie exists, then enforce on mutating API calls.
+
+        One callback instead of two — every request pays a single
+        Python-level dispatch, and the path test is one frozenset
+        lookup plus one startswith instead of chained comparisons.
         """
         if "csrf_token" not in request.cookies:
-            # Store token in g so after_request can set the cookie
-            from flask import g
-            g._new_csrf_token = secrets.token_hex(32)
-
-    @app.after_request
-    def set_csrf_cookie(response):
-        from flask import g
-        new_token = getattr(g, '_new_csrf_token', None)
-        if new_token:
-            response.set_cookie(
-                "csrf_token",
-                new_token,
-                httponly=False,  # JS needs to read it
-                samesite="Strict",
-                secure=request.is_secure,
-                max_age=86400,
-            )
-        return response
+            # Store token in g so after_request can set the cookie.
+            # token_urlsafe packs the same 32 bytes of entropy into 43
+            # chars instead of token_hex's 64 — fewer bytes on the wire
+            # and compared per mutating request.
+            g._new_csrf_token = secrets.token_urlsafe(32)
 
-    @app.before_request
-    def check_csrf_token():
         if request.method in SAFE_METHODS:
             return None
 
-        # Only enforce on API endpoints
-        if not request.path.startswith("/api/"):
-            return None
-
-        # Skip health check
-        if request.path == "/health":
+        # Only enforce on API endpoints; monitoring paths are exempt
+        path = request.path
+        if path in SKIP_PATHS or not path.startswith("/api/"):
             return None
 
         # Skip CSRF for Bearer-token authenticated requests
@@ -117,8 +110,28 @@ def init_csrf(app):
         if not cookie_token or not header_token:
             return jsonify({"error": "CSRF token missing"}), 403
 
+        # Lengths are not secret — reject obviously invalid tokens
+        # before paying for the constant-time scan
+        if (len(cookie_token) != len(header_token)
+                or len(cookie_token) not in TOKEN_LENGTHS):
+            return jsonify({"error": "CSRF token mismatch"}), 403
+
         if not secrets.compare_digest(cookie_token, header_token):
             return jsonify({"error": "CSRF token mismatch"}), 403
 
         return None
 
+    @app.after_request
+    def set_csrf_cookie(response):
+        new_token = getattr(g, '_new_csrf_token', None)
+        if new_token:
+            response.set_cookie(
+                "csrf_token",
+                new_token,
+                httponly=False,  # JS needs to read it
+                samesite="Strict",
+                secure=request.is_secure,
+                max_age=86400,
+            )
+        return response
+
@@ -1,12 +1,27 @@
 """Device Inventory Providers - Flexible external device sources."""
+import logging
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Optional, Any
-import logging
+
+try:
+    import orjson  # Decodes large CMDB dumps several times faster than stdlib json
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _json_body(response):
+    """Decode a response body, preferring orjson over response.json()."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 # ── Standard fields that map to InventoryDevice attributes ──────────────
 STANDARD_FIELDS = {
     "id", "hostname", "ip_address", "vendor_code",
@@ -14,17 +29,20 @@ STANDARD_FIELDS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class InventoryDevice:
     """Device information from external inventory source.
-    
+
     NOTE: This is distinct from the ORM `Device` model in app.models.device.
     This dataclass represents raw device data fetched from external sources
     before it is persisted into the database.
-    
+
     Standard fields are mapped directly to Device ORM columns.
     The `metadata` dict carries extra columns/fields that will be
     stored in Device.extra_data JSONB.
+
+    Providers return these in bulk (up to ~100k per sync), so slots
+    keep the instances __dict__-free.
     """
     id: str  # Unique identifier (hostname or IP)
     hostname: str
@@ -140,7 +158,10 @@ class PostgresInventoryProvider(DeviceInventoryProvider):
         self.extra_columns = config.get("extra_columns", {})
         self._raw_filter_sql = config.get("filter_sql")
         self.filter_sql = self._sanitize_filter_sql(self._raw_filter_sql)
-        self._connection = None
+        self._pool = None
+        # Composed queries per filter-key shape; the column/table config
+        # never changes after __init__, so each shape is built once
+        self._sql_cache: dict = {}
     
     @staticmethod
     def _sanitize_filter_sql(filter_sql: Optional[str]) -> Optional[str]:
@@ -158,104 +179,186 @@ class PostgresInventoryProvider(DeviceInventoryProvider):
         
         return filter_sql
     
-    @property
-    def connection(self):
-        """Lazy connection initialization."""
-        if self._connection is None:
-            import psycopg2
-            self._connection = psycopg2.connect(
+    def _get_pool(self):
+        """Lazy pool initialization.
+
+        Celery workers share one provider across threads; a single
+        connection would serialize them all on libpq, so connections
+        come from a small threaded pool instead.
+        """
+        if self._pool is None:
+            from psycopg2.pool import ThreadedConnectionPool
+            self._pool = ThreadedConnectionPool(
+                1, 10,
                 host=self.host,
                 port=self.port,
                 database=self.database,
                 user=self.user,
                 password=self.password
             )
-        return self._connection
-    
+        return self._pool
+
+    @contextmanager
+    def _conn(self):
+        """Borrow a pooled connection, returning it reset on exit."""
+        pool = self._get_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            try:
+                conn.rollback()  # End the read transaction before reuse
+            except Exception:
+                pass
+            pool.putconn(conn)
+
     def test_connection(self) -> tuple[bool, str]:
         try:
-            conn = self.connection
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
             return True, "Connection successful"
         except Exception as e:
             return False, f"Connection failed: {str(e)}"
     
-    def list_devices(self, filters: Optional[dict] = None) -> list[InventoryDevice]:
-        devices = []
-        
-        # Build SELECT: standard columns + extra columns
-        cols = self.columns
-        select_parts = [f"{v} AS {k}" for k, v in cols.items()]
-        
-        # Extra columns: prefixed with _extra_ to distinguish in result
+    def _build_sql(self, filter_keys: tuple, bulk_ids: bool = False):
+        """Composed SELECT for one filter-key shape, built once.
+
+        Identifiers (table, columns) are quoted via psycopg2.sql instead
+        of interpolated as raw strings, and the composed query is cached
+        per shape so repeated list_devices calls skip the string
+        assembly entirely. With ``bulk_ids`` the shape carries an
+        ``id = ANY(%s)`` clause for get_devices_bulk.
+        """
+        cache_key = (filter_keys, bulk_ids)
+        cached = self._sql_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        from psycopg2 import sql as pgsql
+
+        # Build SELECT: standard columns + extra columns (the latter
+        # prefixed with _extra_ to distinguish in the result)
+        select_parts = [
+            pgsql.SQL("{} AS {}").format(pgsql.Identifier(col), pgsql.Identifier(key))
+            for key, col in self.columns.items()
+        ]
         for extra_key, extra_col in self.extra_columns.items():
-            select_parts.append(f"{extra_col} AS _extra_{extra_key}")
-        
-        select_cols = ", ".join(select_parts)
-        sql = f"SELECT {select_cols} FROM {self.table}"
-        
+            select_parts.append(
+                pgsql.SQL("{} AS {}").format(
+                    pgsql.Identifier(extra_col), pgsql.Identifier(f"_extra_{extra_key}")
+                )
+            )
+
+        query = pgsql.SQL("SELECT {cols} FROM {table}").format(
+            cols=pgsql.SQL(", ").join(select_parts),
+            table=pgsql.Identifier(*self.table.split(".")),
+        )
+
         where_clauses = []
-        params = []
-        
         if self.filter_sql:
-            where_clauses.append(f"({self.filter_sql})")
-        
-        if filters:
-            for key, value in filters.items():
-                if key in cols:
-                    where_clauses.append(f"{cols[key]} = %s")
-                    params.append(value)
-        
+            where_clauses.append(pgsql.SQL("({})").format(pgsql.SQL(self.filter_sql)))
+        for key in filter_keys:
+            where_clauses.append(
+                pgsql.SQL("{} = %s").format(pgsql.Identifier(self.columns[key]))
+            )
+        if bulk_ids:
+            where_clauses.append(
+                pgsql.SQL("{} = ANY(%s)").format(
+                    pgsql.Identifier(self.columns.get("id", "id"))
+                )
+            )
         if where_clauses:
-            sql += " WHERE " + " AND ".join(where_clauses)
-        
+            query = pgsql.SQL("{} WHERE {}").format(
+                query, pgsql.SQL(" AND ").join(where_clauses)
+            )
+
+        self._sql_cache[cache_key] = query
+        return query
+
+    def list_devices(self, filters: Optional[dict] = None) -> list[InventoryDevice]:
+        cols = self.columns
+        filter_keys = tuple(k for k in (filters or ()) if k in cols)
+        params = [filters[k] for k in filter_keys]
+        sql = self._build_sql(filter_keys)
+        return self._fetch_devices(sql, params)
+
+    def _fetch_devices(self, sql, params) -> list[InventoryDevice]:
+        """Run a composed SELECT and map rows to InventoryDevice."""
+        devices = []
+        cols = self.columns
+
+        # The SELECT list is built above, so every column's position is
+        # known up front — no need to rebuild a dict per row from
+        # cursor.description
+        std_index = {key: i for i, key in enumerate(cols)}
+        n_std = len(cols)
+        extra_keys = list(self.extra_columns)
+
+        get_idx = std_index.get
+        id_i, host_i = get_idx("id"), get_idx("hostname")
+        ip_i, vendor_i = get_idx("ip_address"), get_idx("vendor_code")
+        group_i, loc_i = get_idx("group"), get_idx("location")
+        os_i, hw_i = get_idx("os_version"), get_idx("hardware")
+        active_i = get_idx("is_active")
+
+        def col(row, i):
+            return row[i] if i is not None else None
+
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(sql, params)
-            
-            for row in cursor.fetchall():
-                desc = cursor.description
-                row_dict = {desc[i][0]: value for i, value in enumerate(row)}
-                
-                # Split standard fields from extra fields
-                extra_data = {}
-                for key in list(row_dict.keys()):
-                    if key.startswith("_extra_"):
-                        real_key = key[7:]  # strip "_extra_" prefix
-                        val = row_dict.pop(key)
-                        if val is not None:
-                            extra_data[real_key] = str(val) if not isinstance(val, str) else val
-                
-                devices.append(InventoryDevice(
-                    id=str(row_dict.get("id", "")),
-                    hostname=str(row_dict.get("hostname", "")),
-                    ip_address=row_dict.get("ip_address"),
-                    vendor_code=row_dict.get("vendor_code"),
-                    group=row_dict.get("group"),
-                    location=row_dict.get("location"),
-                    os_version=row_dict.get("os_version"),
-                    hardware=row_dict.get("hardware"),
-                    is_active=bool(row_dict.get("is_active", True)),
-                    metadata=extra_data or None
-                ))
-            
-            cursor.close()
-            
+            # Named (server-side) cursor streams rows in batches instead
+            # of materializing a 100k-device inventory in the client
+            # buffer before the first row is processed
+            with self._conn() as conn:
+                with conn.cursor(name="hcs_list_devices") as cursor:
+                    cursor.itersize = 2000
+                    cursor.execute(sql, params)
+
+                    for row in cursor:
+                        extra_data = {}
+                        for j, key in enumerate(extra_keys, start=n_std):
+                            val = row[j]
+                            if val is not None:
+                                extra_data[key] = val if isinstance(val, str) else str(val)
+
+                        devices.append(InventoryDevice(
+                            id=str(col(row, id_i) or ""),
+                            hostname=str(col(row, host_i) or ""),
+                            ip_address=col(row, ip_i),
+                            vendor_code=col(row, vendor_i),
+                            group=col(row, group_i),
+                            location=col(row, loc_i),
+                            os_version=col(row, os_i),
+                            hardware=col(row, hw_i),
+                            is_active=bool(row[active_i]) if active_i is not None else True,
+                            metadata=extra_data or None
+                        ))
+
         except Exception as e:
             logger.error(f"Failed to list devices: {e}")
-        
+
         return devices
-    
+
     def get_device(self, device_id: str) -> Optional[InventoryDevice]:
         devices = self.list_devices({"id": device_id})
         return devices[0] if devices else None
-    
+
+    def get_devices_bulk(self, device_ids: list[str]) -> list[InventoryDevice]:
+        """Fetch many devices in one round-trip via ``id = ANY(%s)``.
+
+        N separate get_device calls cost N query round-trips; a scan
+        over a device group resolves them all here in a single SELECT.
+        """
+        if not device_ids:
+            return []
+        sql = self._build_sql((), bulk_ids=True)
+        return self._fetch_devices(sql, [list(device_ids)])
+
     def close(self):
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        if self._pool:
+            self._pool.closeall()
+            self._pool = None
 
 
 class APIInventoryProvider(DeviceInventoryProvider):
@@ -277,26 +380,65 @@ class APIInventoryProvider(DeviceInventoryProvider):
             "os_version": "sw_version",
             "hardware": "model"
         },
-        "extra_fields": ["serial_number", "department", "rack", "firmware"]
+        "extra_fields": ["serial_number", "department", "rack", "firmware"],
+        "detail_endpoint": "/devices/{id}",
+        "cache_ttl": 60
     }
-    
+
     `field_mapping` maps standard InventoryDevice fields to API response keys.
     `extra_fields` lists additional API response keys to pull into metadata.
     Any key NOT in field_mapping and NOT in extra_fields is ignored.
+
+    `detail_endpoint` (optional) fetches a single device directly instead
+    of filtering the list endpoint. `cache_ttl` (seconds, 0 disables)
+    keeps recent responses in memory — scans call get_device once per
+    rule, and REST is the slowest inventory source.
     """
-    
+
+    _LIST_CACHE_MAX = 64
+
     def __init__(self, config: dict):
         import requests
         self.base_url = config.get("base_url", "").rstrip("/")
         self.endpoint = config.get("endpoint", "/devices")
+        self.detail_endpoint = config.get("detail_endpoint")
         self.auth_type = config.get("auth_type", "bearer")
         self.auth_value = config.get("auth_value") or config.get("token", "")
         self.response_path = config.get("response_path")
+        # Split the dot-path once; _extract_data walks it per response
+        self._path_parts = tuple(self.response_path.split(".")) if self.response_path else ()
         self.field_mapping = config.get("field_mapping", {})
         self.extra_fields = config.get("extra_fields", [])
         self.timeout = config.get("timeout", 30)
-        
+        self.cache_ttl = config.get("cache_ttl", 60)
+
+        # Resolve mapping keys once: _map_device runs per device on
+        # responses of up to tens of thousands, and re-probing
+        # field_mapping (plus splitting dot-paths) per field added a
+        # dozen dict hits per device. Plain keys stay strings (one
+        # raw.get); dot-paths become pre-split tuples.
+        self._field_keys = {
+            f: self._compile_key(self.field_mapping.get(f, f))
+            for f in ("id", "hostname", "ip_address", "vendor_code", "group",
+                      "location", "os_version", "hardware", "is_active")
+        }
+        # (metadata key, accessor key) pairs — nested paths keep their
+        # leaf name, as before
+        self._extra_keys = [
+            (f.rsplit(".", 1)[-1] if "." in f else f, self._compile_key(f))
+            for f in self.extra_fields
+        ]
+
+        # (expires, devices) per filter set / per device id
+        self._list_cache: OrderedDict = OrderedDict()
+        self._by_id: dict = {}
+
         self._session = requests.Session()
+        # Celery workers share a provider across threads; a wider pool
+        # keeps concurrent callers on keep-alive connections
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         
         # Set up auth
         if self.auth_type == "bearer":
@@ -321,65 +463,81 @@ class APIInventoryProvider(DeviceInventoryProvider):
             return False, f"Connection failed: {str(e)}"
     
     def _extract_data(self, response_data: Any) -> list[dict]:
-        """Extract devices list from response using dot-path."""
-        if not self.response_path:
-            return response_data if isinstance(response_data, list) else []
-        
+        """Extract devices list from response using the pre-split dot-path."""
         data = response_data
-        for key in self.response_path.split("."):
-            if isinstance(data, dict):
-                data = data.get(key, [])
-            else:
+        for key in self._path_parts:
+            try:
+                data = data[key]
+            except (KeyError, TypeError):
                 return []
-        
+
         return data if isinstance(data, list) else []
     
-    def _get_field(self, raw: dict, name: str):
-        """Get a field value from raw dict, applying field_mapping if configured."""
-        if name in self.field_mapping:
-            # Mapping value can be a dot-path for nested access
-            path = self.field_mapping[name]
-            return self._resolve_path(raw, path)
-        return raw.get(name)
-    
     @staticmethod
-    def _resolve_path(data: dict, path: str):
-        """Resolve a dot-separated path in a nested dict."""
-        for key in path.split("."):
+    def _compile_key(key: str):
+        """Pre-split a mapping key; dot-paths become tuples."""
+        return tuple(key.split(".")) if "." in key else key
+
+    @staticmethod
+    def _fetch(raw: dict, key):
+        """Fetch a value by a compiled key (plain string or path tuple)."""
+        if type(key) is not tuple:
+            return raw.get(key)
+        data = raw
+        for k in key:
             if isinstance(data, dict):
-                data = data.get(key)
+                data = data.get(k)
             else:
                 return None
         return data
-    
+
+    def _get_field(self, raw: dict, name: str):
+        """Get a field value from raw dict, applying field_mapping if configured."""
+        return self._fetch(raw, self._field_keys.get(name, name))
+
     def _map_device(self, raw: dict) -> InventoryDevice:
         """Map API response to InventoryDevice, including extra fields."""
+        keys = self._field_keys
+        fetch = self._fetch
+
         # Standard fields
-        dev_id = self._get_field(raw, "id") or self._get_field(raw, "hostname") or ""
-        
+        dev_id = fetch(raw, keys["id"]) or fetch(raw, keys["hostname"]) or ""
+
         # Extra fields → metadata dict
         extra_data = {}
-        for field_name in self.extra_fields:
-            val = self._resolve_path(raw, field_name) if "." in field_name else raw.get(field_name)
+        for meta_key, key in self._extra_keys:
+            val = fetch(raw, key)
             if val is not None:
-                # Use the leaf key name for nested paths
-                key = field_name.split(".")[-1] if "." in field_name else field_name
-                extra_data[key] = str(val) if not isinstance(val, (str, int, float, bool)) else val
-        
+                extra_data[meta_key] = str(val) if not isinstance(val, (str, int, float, bool)) else val
+
         return InventoryDevice(
             id=str(dev_id),
-            hostname=str(self._get_field(raw, "hostname") or ""),
-            ip_address=self._get_field(raw, "ip_address"),
-            vendor_code=self._get_field(raw, "vendor_code"),
-            group=self._get_field(raw, "group"),
-            location=self._get_field(raw, "location"),
-            os_version=self._get_field(raw, "os_version"),
-            hardware=self._get_field(raw, "hardware"),
-            is_active=bool(self._get_field(raw, "is_active") or True),
+            hostname=str(fetch(raw, keys["hostname"]) or ""),
+            ip_address=fetch(raw, keys["ip_address"]),
+            vendor_code=fetch(raw, keys["vendor_code"]),
+            group=fetch(raw, keys["group"]),
+            location=fetch(raw, keys["location"]),
+            os_version=fetch(raw, keys["os_version"]),
+            hardware=fetch(raw, keys["hardware"]),
+            is_active=bool(fetch(raw, keys["is_active"]) or True),
             metadata=extra_data or None
         )
     
     def list_devices(self, filters: Optional[dict] = None) -> list[InventoryDevice]:
+        # Identical list requests repeat within one scan; serve them
+        # from the TTL cache instead of a fresh HTTP round-trip
+        now = time.monotonic()
+        try:
+            cache_key = frozenset((filters or {}).items())
+        except TypeError:
+            cache_key = None  # Unhashable filter value — skip caching
+
+        if cache_key is not None:
+            hit = self._list_cache.get(cache_key)
+            if hit is not None and hit[0] > now:
+                self._list_cache.move_to_end(cache_key)
+                return hit[1]
+
         try:
             params = filters or {}
             response = self._session.get(
@@ -388,18 +546,56 @@ class APIInventoryProvider(DeviceInventoryProvider):
                 timeout=self.timeout
             )
             response.raise_for_status()
-            
-            raw_devices = self._extract_data(response.json())
-            return [self._map_device(d) for d in raw_devices]
-            
+
+            raw_devices = self._extract_data(_json_body(response))
+            devices = [self._map_device(d) for d in raw_devices]
+
+            if self.cache_ttl > 0:
+                expires = now + self.cache_ttl
+                if cache_key is not None:
+                    self._list_cache[cache_key] = (expires, devices)
+                    if len(self._list_cache) > self._LIST_CACHE_MAX:
+                        self._list_cache.popitem(last=False)
+                # Every listed device also answers get_device from memory
+                for device in devices:
+                    self._by_id[device.id] = (expires, device)
+
+            return devices
+
         except Exception as e:
             logger.error(f"Failed to list devices from API: {e}")
             return []
-    
+
     def get_device(self, device_id: str) -> Optional[InventoryDevice]:
+        hit = self._by_id.get(device_id)
+        if hit is not None and hit[0] > time.monotonic():
+            return hit[1]
+
+        # A dedicated detail endpoint avoids filtering (and possibly
+        # scanning) the whole list resource for one device
+        if self.detail_endpoint:
+            try:
+                response = self._session.get(
+                    f"{self.base_url}{self.detail_endpoint.format(id=device_id)}",
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                raw = _json_body(response)
+                if isinstance(raw, list):
+                    raw = raw[0] if raw else None
+                if not isinstance(raw, dict):
+                    return None
+                device = self._map_device(raw)
+                if self.cache_ttl > 0:
+                    self._by_id[device.id] = (time.monotonic() + self.cache_ttl, device)
+                return device
+            except Exception as e:
+                logger.error(f"Failed to get device {device_id} from API: {e}")
+                return None
+
         devices = self.list_devices({"id": device_id})
         return devices[0] if devices else None
-    
+
     def close(self):
         self._session.close()
 
@@ -428,10 +624,41 @@ class StaticInventoryProvider(DeviceInventoryProvider):
     Any extra keys (not in STANDARD_FIELDS) are placed in metadata.
     """
     
+    # UI filters hit the same handful of fields over and over
+    _INDEXED_FIELDS = ("hostname", "ip_address", "vendor_code", "group",
+                       "location", "is_active")
+
     def __init__(self, config: dict):
         devices_list = config.get("devices", []) if isinstance(config, dict) else config
         self.devices = [self._parse_device(d) for d in devices_list]
-    
+
+        # The device list is fixed after init, so index it once:
+        # posting sets of device positions per field value turn repeated
+        # filter calls from O(N·F) attribute scans into set intersections
+        self._by_id = {}
+        self._index: dict = {f: {} for f in self._INDEXED_FIELDS}
+        for i, device in enumerate(self.devices):
+            self._by_id.setdefault(device.id, device)
+            for f in self._INDEXED_FIELDS:
+                val = getattr(device, f)
+                if val is None and device.metadata:
+                    val = device.metadata.get(f)
+                try:
+                    self._index[f].setdefault(val, set()).add(i)
+                except TypeError:
+                    pass  # Unhashable value — lookups fall back to a scan
+
+    def _matches(self, device: InventoryDevice, filters: dict) -> bool:
+        for k, v in filters.items():
+            # Check standard fields first
+            dev_val = getattr(device, k, None)
+            if dev_val is None and device.metadata:
+                # Check extra_data too
+                dev_val = device.metadata.get(k)
+            if dev_val != v:
+                return False
+        return True
+
     @staticmethod
     def _parse_device(d: dict) -> InventoryDevice:
         """Parse a device dict, separating standard from extra fields."""
@@ -463,25 +690,35 @@ class StaticInventoryProvider(DeviceInventoryProvider):
     def list_devices(self, filters: Optional[dict] = None) -> list[InventoryDevice]:
         if not filters:
             return self.devices.copy()
-        
-        result = []
-        for d in self.devices:
-            match = True
-            for k, v in filters.items():
-                # Check standard fields first
-                dev_val = getattr(d, k, None)
-                if dev_val is None and d.metadata:
-                    # Check extra_data too
-                    dev_val = d.metadata.get(k)
-                if dev_val != v:
-                    match = False
-                    break
-            if match:
-                result.append(d)
-        return result
-    
+
+        # Intersect posting lists for the indexed filters; anything
+        # non-indexed (metadata keys, unhashable values) stays in a
+        # residual dict applied linearly over the narrowed candidates
+        candidates = None
+        residual = {}
+        for k, v in filters.items():
+            index = self._index.get(k)
+            if index is None:
+                residual[k] = v
+                continue
+            try:
+                posting = index.get(v)
+            except TypeError:
+                residual[k] = v
+                continue
+            if not posting:
+                return []
+            candidates = posting if candidates is None else candidates & posting
+
+        if candidates is None:
+            matched = self.devices
+        else:
+            # sorted() restores the original inventory order
+            matched = [self.devices[i] for i in sorted(candidates)]
+
+        if not residual:
+            return list(matched)
+        return [d for d in matched if self._matches(d, residual)]
+
     def get_device(self, device_id: str) -> Optional[InventoryDevice]:
-        for d in self.devices:
-            if d.id == device_id:
-                return d
-        return None
+        return self._by_id.get(device_id)
@@ -8,6 +8,24 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from app.extensions import db
 
 
+def _argon2_hasher():
+    """Shared argon2id hasher, or None when argon2-cffi is missing."""
+    global _ARGON2_HASHER
+    if _ARGON2_HASHER is False:
+        return None
+    if _ARGON2_HASHER is None:
+        try:
+            from argon2 import PasswordHasher
+        except ImportError:
+            _ARGON2_HASHER = False
+            return None
+        _ARGON2_HASHER = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+    return _ARGON2_HASHER
+
+
+_ARGON2_HASHER = None
+
+
 class User(db.Model):
     """HCS user account.
 
@@ -43,13 +61,33 @@ class User(db.Model):
     # ── Password helpers ───────────────────────────────────────────
 
     def set_password(self, plain: str):
-        """Hash and store password (local users only)."""
+        """Hash and store password (local users only).
+
+        Uses argon2id when PASSWORD_HASHER='argon2' and argon2-cffi is
+        installed (C implementation — cheaper per verify than tuned
+        pbkdf2 at equivalent security), otherwise werkzeug pbkdf2.
+        """
+        from app.config import settings
+
+        if getattr(settings, "PASSWORD_HASHER", "argon2") == "argon2":
+            hasher = _argon2_hasher()
+            if hasher is not None:
+                self.password_hash = hasher.hash(plain)
+                return
         self.password_hash = generate_password_hash(plain, method="pbkdf2:sha256")
 
     def check_password(self, plain: str) -> bool:
-        """Verify password against stored hash."""
+        """Verify password against stored hash (argon2 or pbkdf2)."""
         if not self.password_hash:
             return False
+        if self.password_hash.startswith("$argon2"):
+            hasher = _argon2_hasher()
+            if hasher is None:
+                return False
+            try:
+                return hasher.verify(self.password_hash, plain)
+            except Exception:
+                return False
         return check_password_hash(self.password_hash, plain)
 
     # ── Serialization ──────────────────────────────────────────────
@@ -10,5 +10,6 @@ _flask_app = create_app()
 from app.tasks.scan_tasks import run_scan  # noqa: F401, E402
 from app.tasks import sync_tasks  # noqa: F401, E402
 from app.tasks import maintenance_tasks  # noqa: F401, E402
+from app.tasks import test_tasks  # noqa: F401, E402
 
 __all__ = ["celery", "run_scan"]
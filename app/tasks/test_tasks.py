@@ -0,0 +1,22 @@
+"""Celery tasks for the Rule Builder sandbox."""
+import logging
+
+from app.engine import RuleEvaluator
+from app.extensions import celery
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(name="hcs.test_rule")
+def test_rule_task(config: str, logic_type: str, logic_payload: dict):
+    """Evaluate a sandbox rule against a config.
+
+    Used by /api/test/rule for configs too large to evaluate inline
+    without blocking a WSGI worker.
+    """
+    evaluator = RuleEvaluator()
+    return evaluator.test_rule(
+        config=config,
+        logic_type=logic_type,
+        logic_payload=logic_payload,
+    )